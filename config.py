@@ -2,27 +2,206 @@
 Configuration settings for Excel Tags Parser application
 """
 import os
+import logging
+import math
+import time
+import multiprocessing as mp
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from pymongo import IndexModel, ASCENDING
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+
+try:
+    import psutil
+except ImportError:  # psutil is optional; chunk sizing falls back to a fixed default
+    psutil = None
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Deployment-tunable settings, read once from environment variables."""
+    chunk_size: Optional[int]  # Fixed rows per chunk; None sizes chunks from available memory
+    chunk_row_bytes: int
+    num_workers: int
+    max_file_size_mb: int
+    stream_threshold_mb: int
+    log_level: str
+    mongodb_uri: str
+    mongodb_database: str
+    mongodb_collection: str
+    mongodb_bulk_batch: int
+    mongodb_insert_workers: int
+    excel_backend: str
+
+
+def _env_int(name: str, default: Optional[int]) -> Optional[int]:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Load settings from environment variables (cached after the first call).
+
+    Environment variables: CHUNK_SIZE, CHUNK_ROW_BYTES, NUM_WORKERS,
+    MAX_FILE_SIZE_MB, STREAM_THRESHOLD_MB, LOG_LEVEL, MONGODB_URI,
+    MONGODB_DATABASE, MONGODB_COLLECTION, MONGODB_BULK_BATCH,
+    MONGODB_INSERT_WORKERS, EXCEL_BACKEND.
+
+    Returns:
+        Settings instance
+    """
+    # Leave one core for the reader/main process
+    num_workers = max(1, _env_int('NUM_WORKERS', (os.cpu_count() or 2) - 1))
+    insert_workers = max(1, _env_int('MONGODB_INSERT_WORKERS', 4))
+
+    # Tuned for bulk ingest: wire compression, a pool sized to the worker count
+    # plus the concurrent insert threads, kept warm with a few idle connections,
+    # and acknowledged-but-unjournaled writes.
+    max_pool_size = 2 * num_workers + insert_workers
+    default_uri = (
+        f'mongodb://localhost:27017/?compressors=zstd,zlib&maxPoolSize={max_pool_size}'
+        f'&minPoolSize={insert_workers}'
+        '&w=1&journal=false&retryWrites=true&appname=excel-tags-parser'
+    )
+
+    return Settings(
+        chunk_size=_env_int('CHUNK_SIZE', None),
+        chunk_row_bytes=_env_int('CHUNK_ROW_BYTES', 2048),
+        num_workers=num_workers,
+        max_file_size_mb=_env_int('MAX_FILE_SIZE_MB', 500),
+        stream_threshold_mb=_env_int('STREAM_THRESHOLD_MB', 50),
+        log_level=os.getenv('LOG_LEVEL', 'INFO').upper(),
+        mongodb_uri=os.getenv('MONGODB_URI', default_uri),
+        mongodb_database=os.getenv('MONGODB_DATABASE', 'azure'),
+        mongodb_collection=os.getenv('MONGODB_COLLECTION', 'resources'),
+        mongodb_bulk_batch=_env_int('MONGODB_BULK_BATCH', 200),
+        mongodb_insert_workers=insert_workers,
+        excel_backend=os.getenv('EXCEL_BACKEND', 'auto').lower(),
+    )
+
+
+_settings = get_settings()
 
 # Application settings
-CHUNK_SIZE = 10000  # Rows per chunk for processing
-MAX_FILE_SIZE_MB = 500  # Maximum upload file size in MB
-ALLOWED_EXTENSIONS = ['.xlsx', '.xls']
+DEFAULT_CHUNK_SIZE = 10000  # Used when available memory cannot be determined
+MIN_CHUNK_SIZE = 1_000
+MAX_CHUNK_SIZE = 200_000
+CHUNK_MEMORY_FRACTION = 0.05  # Share of available memory a single chunk may use
+CHUNK_ROW_BYTES = _settings.chunk_row_bytes  # Estimated in-memory size of one row
+CHUNK_CELL_BYTES = 100  # Estimated in-memory size of one cell, used once the sheet width is known
+
+
+def get_chunk_size(row_bytes: int = None) -> int:
+    """
+    Compute the number of rows per processing chunk from available memory.
+
+    Callers that know the sheet width (e.g. after reading the header row)
+    can pass a better row size estimate to refine the default. A CHUNK_SIZE
+    environment variable overrides the computed value.
+
+    Args:
+        row_bytes: Estimated bytes per row (default: CHUNK_ROW_BYTES)
+
+    Returns:
+        Rows per chunk, clamped to [MIN_CHUNK_SIZE, MAX_CHUNK_SIZE]
+    """
+    if _settings.chunk_size:
+        return _settings.chunk_size
+
+    if row_bytes is None or row_bytes <= 0:
+        row_bytes = CHUNK_ROW_BYTES
+
+    if psutil is None:
+        return DEFAULT_CHUNK_SIZE
+
+    available_bytes = psutil.virtual_memory().available
+    return int(min(MAX_CHUNK_SIZE, max(MIN_CHUNK_SIZE, available_bytes * CHUNK_MEMORY_FRACTION / row_bytes)))
+
+
+CHUNK_SIZE = get_chunk_size()  # Rows per chunk for processing
+MAX_FILE_SIZE_MB = _settings.max_file_size_mb  # Maximum upload file size in MB
+STREAM_THRESHOLD_MB = _settings.stream_threshold_mb  # Files above this size are scanned row-by-row instead of loaded into a DataFrame
+USE_STREAMING_READER = True  # Set to False to always load files with pandas
+READ_PREFETCH_CHUNKS = 2  # Chunks read ahead by a background thread while the caller processes the current one
+ALLOWED_EXTENSIONS = frozenset({'.xlsx', '.xls'})
+
+
+def is_allowed(filename: str) -> bool:
+    """
+    Check whether a file name has an allowed Excel extension (case-insensitive).
+
+    Args:
+        filename: File name or path
+
+    Returns:
+        True if the extension is in ALLOWED_EXTENSIONS
+    """
+    return os.path.splitext(filename)[1].casefold() in ALLOWED_EXTENSIONS
+
+# Excel parsing backend: 'openpyxl' (pure Python), 'calamine' (Rust, needs
+# python-calamine) or 'auto' (calamine when installed, otherwise openpyxl)
+EXCEL_BACKENDS = ('auto', 'openpyxl', 'calamine')
+EXCEL_BACKEND = _settings.excel_backend
 
 # Performance settings
-NUM_WORKERS = 4  # Number of parallel workers for multiprocessing
-ENABLE_PARALLEL_PROCESSING = False  # Set to True for parallel processing
+NUM_WORKERS = _settings.num_workers  # Leave one core for the reader/main process
+ENABLE_PARALLEL_PROCESSING = NUM_WORKERS >= 4  # Only worth the process overhead on multicore hosts
+POOL_MAX_TASKS_PER_CHILD = 32  # Recycle workers to cap RSS growth from pandas caches
+
+
+def get_worker_count(file_rows: int = None) -> int:
+    """
+    Get the number of worker processes to use for a file.
+
+    Never starts more workers than there are chunks to process.
+
+    Args:
+        file_rows: Total number of data rows in the file (None = unknown)
+
+    Returns:
+        Number of worker processes
+    """
+    if not file_rows or file_rows <= 0:
+        return NUM_WORKERS
+    return max(1, min(NUM_WORKERS, math.ceil(file_rows / CHUNK_SIZE)))
+
+
+def make_pool(processes: int = None):
+    """
+    Create a multiprocessing pool for chunk processing.
+
+    Args:
+        processes: Number of worker processes (default: NUM_WORKERS)
+
+    Returns:
+        multiprocessing Pool instance (use as a context manager)
+    """
+    return mp.Pool(processes or NUM_WORKERS, maxtasksperchild=POOL_MAX_TASKS_PER_CHILD)
 
 # Directory paths
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-UPLOAD_DIR = os.path.join(BASE_DIR, 'data', 'uploads')
-PROCESSED_DIR = os.path.join(BASE_DIR, 'data', 'processed')
+BASE_DIR = Path(__file__).resolve().parent
+UPLOAD_DIR = BASE_DIR / 'data' / 'uploads'
+PROCESSED_DIR = BASE_DIR / 'data' / 'processed'
+
 
-# Create directories if they don't exist
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-os.makedirs(PROCESSED_DIR, exist_ok=True)
+def ensure_dirs() -> None:
+    """
+    Create the upload and processed directories if they don't exist.
+
+    Called from entry points only, so importing config (e.g. in pool
+    workers or tests) never touches the filesystem.
+    """
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
 
 # Tag parsing configuration
-TAG_SEPARATORS = [',', ';', '|']
+TAG_SEPARATORS = (',', ';', '|')
 KEY_VALUE_SEPARATOR = ':'
 
 # Column names
@@ -32,23 +211,123 @@ NEW_COLUMNS = {
     'environment': 'Environment',
     'owner': 'Owner'
 }
+NEW_COLUMN_ORDER = ('Application Name', 'Environment', 'Owner')
+# Low-cardinality parsed columns whose values are interned (one shared str per distinct value)
+INTERN_COLUMNS = frozenset({'Environment', 'Owner'})
 
 # Logging configuration
-LOG_LEVEL = 'INFO'
+LOG_LEVEL = _settings.log_level
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Get a logger with the configured LOG_LEVEL applied.
+
+    Per-row code paths should log with %-style arguments
+    (logger.debug("x=%s", x)) rather than f-strings, so the message is
+    only formatted when the level is actually enabled.
+
+    Args:
+        name: Logger name (usually __name__)
+
+    Returns:
+        Logger instance
+    """
+    logger = logging.getLogger(name)
+    logger.setLevel(LOG_LEVEL)
+    return logger
+
 # File naming
 OUTPUT_FILENAME_PREFIX = 'processed_'
 OUTPUT_FILENAME_TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S'
 
-# MongoDB configuration
-MONGODB_URI = 'mongodb://localhost:27017/'
-MONGODB_DATABASE = 'azure'
-MONGODB_COLLECTION = 'resources'
 
-# MongoDB indexes for performance
+def make_output_name(original_filename: str, ts: time.struct_time = None) -> str:
+    """
+    Build the processed output file name: <prefix><timestamp>_<original name>.
+
+    Args:
+        original_filename: Name of the uploaded/input file
+        ts: Timestamp to use (default: current local time)
+
+    Returns:
+        Output file name (without directory)
+    """
+    timestamp = time.strftime(OUTPUT_FILENAME_TIMESTAMP_FORMAT, ts or time.localtime())
+    return f"{OUTPUT_FILENAME_PREFIX}{timestamp}_{original_filename}"
+
+# MongoDB configuration (see get_settings() for the default URI options)
+MONGODB_URI = _settings.mongodb_uri
+MONGODB_BULK_ORDERED = False  # Unordered bulk writes let the server continue past errors and parallelize
+MONGODB_BULK_BATCH = _settings.mongodb_bulk_batch  # Documents per bulk write round-trip; small batches keep MONGODB_INSERT_WORKERS busy
+MONGODB_WRITE_BATCH_BYTES = 15 * 1024 * 1024  # Close a batch before this many BSON bytes (server limit is 16 MB)
+MONGODB_USE_CLIENT_BULK = True  # Use the MongoDB 8.0+ client-level bulkWrite command when available
+MONGODB_INSERT_WORKERS = _settings.mongodb_insert_workers  # Unordered batches in flight at once (threads sharing the client's pool)
+# Encode each document to BSON once while preparing it and insert the raw
+# bytes through a collection handle using these codec options
+MONGODB_RAW_BSON = True
+BSON_CODEC_OPTIONS = CodecOptions(document_class=RawBSONDocument, tz_aware=False)
+MONGODB_DATABASE = _settings.mongodb_database
+MONGODB_COLLECTION = _settings.mongodb_collection
+
+# MongoDB indexes for performance (submitted together via collection.create_indexes)
+# Compound keys follow the ESR rule: equality fields first, then sort, then range.
+# Every index is maintained on each insert, so a single-field index that is the
+# prefix of a compound one is left out: the compound index serves those queries.
+# The MCP server uses this list too, and tries the entries in order for hints.
+# MONGODB_COVERED_PROJECTION below must stay a subset of the keys of
+# MONGODB_COVERED_INDEX (and exclude _id), or covered reads will FETCH documents.
 MONGODB_INDEXES = [
-    'Application Name',
-    'Environment',
-    'Owner'
+    # Filter by application + environment, sort/filter by owner.
+    # Partial: rows without tags have no applicationName, so they are left
+    # out of the index. Queries must include applicationName as an equality
+    # (or range on a non-empty string) for the planner to pick this index.
+    # $gt '' only matches non-empty strings; $ne is not allowed in a
+    # partialFilterExpression.
+    IndexModel(
+        [('applicationName', ASCENDING), ('environment', ASCENDING), ('owner', ASCENDING)],
+        partialFilterExpression={'applicationName': {'$gt': ''}},
+        name='app_env_owner_partial',
+        background=True
+    ),
+    IndexModel([('applicationName', ASCENDING)], background=True),
+    IndexModel([('owner', ASCENDING)], background=True),
+    IndexModel([('cost', ASCENDING)], background=True),
+    IndexModel([('metadata.importDate', ASCENDING)], background=True),
+    IndexModel([('environment', ASCENDING), ('owner', ASCENDING)], background=True),
+    IndexModel([('environment', ASCENDING), ('cost', ASCENDING)], background=True),
+    # Covers the MCP environment/application heatmap grouping
+    IndexModel([('environment', ASCENDING), ('applicationName', ASCENDING)], background=True),
+    IndexModel([('date', ASCENDING), ('environment', ASCENDING)], background=True),
+    IndexModel([('date', ASCENDING), ('applicationName', ASCENDING)], background=True),
+    # Covers the filter + cost $group of the MCP total cost query
+    IndexModel(
+        [('applicationName', ASCENDING), ('environment', ASCENDING), ('owner', ASCENDING),
+         ('date', ASCENDING), ('cost', ASCENDING)],
+        name='app_env_owner_date_cost',
+        background=True
+    ),
+    # Common ad-hoc filter / group-by fields parsed from tags (MCP advanced_query,
+    # aggregate_by_any_field)
+    IndexModel([('department', ASCENDING), ('usage', ASCENDING)], background=True),
+    IndexModel([('primaryContact', ASCENDING)], background=True),
+    IndexModel([('usage', ASCENDING)], background=True),
 ]
+
+# Indexes replaced by entries above; dropped by create_indexes() if present.
+# Earlier versions created these: applicationName + environment is a prefix of
+# app_env_owner_partial; environment, date and department are prefixes of the
+# compound indexes led by them; no query uses the text index on tags.raw.
+MONGODB_SUPERSEDED_INDEXES = (
+    'applicationName_1_environment_1',
+    'app_env_owner',
+    'environment_1',
+    'date_1',
+    'department_1',
+    'tags.raw_text',
+)
+
+# Projection that can be answered from the app_env_owner_partial index alone (covered query)
+MONGODB_COVERED_INDEX = 'app_env_owner_partial'
+MONGODB_COVERED_PROJECTION = {'applicationName': 1, 'environment': 1, 'owner': 1, '_id': 0}
@@ -7,19 +7,32 @@ for Azure resources data. It can be used with open-source LLMs.
 """
 
 import asyncio
-import json
+import atexit
+import base64
+import functools
 import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
 from typing import Any, Dict, List
 from datetime import datetime
 
 from mcp.server import Server
 from mcp.types import Tool, TextContent, ImageContent, EmbeddedResource
-from pymongo import MongoClient
-import pandas as pd
+from bson import Binary, ObjectId
+from pymongo import ASCENDING, AsyncMongoClient
+import numpy as np
+import orjson
 import plotly.express as px
 import plotly.graph_objects as go
 import plotly.io as pio
 
+# Repository root, for the index definitions shared with the import side
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("mongodb-mcp-server")
@@ -29,26 +42,679 @@ MONGODB_URI = "mongodb://localhost:27017/"
 MONGODB_DATABASE = "azure"
 MONGODB_COLLECTION = "resources"
 
+# Client settings: a pool sized for concurrent tool calls (kept warm), wire compression
+# for large result sets (zstd via the pymongo[zstd] extra; the driver skips
+# compressors that are not installed), fail fast when MongoDB is down, and
+# read from the nearest replica set member (ignored on a standalone server)
+MONGODB_CLIENT_OPTIONS = {
+    "maxPoolSize": 50,
+    "minPoolSize": 5,
+    "compressors": "zstd,zlib",
+    "zlibCompressionLevel": 3,
+    "serverSelectionTimeoutMS": 2000,
+    "readPreference": "nearest",
+}
+
+# Seconds to reuse results of expensive, slowly-changing tools (statistics, field lists)
+CACHE_TTL_SECONDS = 60
+
+# Seconds to reuse the database schema description (changes only with new imports)
+SCHEMA_CACHE_TTL_SECONDS = 300
+
+# Number of rendered chart images kept (least recently used are evicted)
+CHART_CACHE_SIZE = 64
+
+# Number of analysis tool results kept (reused for CACHE_TTL_SECONDS at most)
+ANALYSIS_CACHE_SIZE = 512
+
+# Seconds to reuse a collection version check between cached tool calls
+COLLECTION_VERSION_TTL_SECONDS = 5
+
+# Projection for result documents when no fields are requested: originalData
+# repeats every Excel column and is usually most of the document
+DEFAULT_RESULT_PROJECTION = {"originalData": 0}
+
+# Default documents per aggregation cursor batch when the result size is not
+# bounded by a $limit; limited queries use the limit so they finish in one reply
+CURSOR_BATCH_SIZE = 500
+
+# Server-side time budget for a single aggregation (fails instead of running away)
+AGGREGATE_MAX_TIME_MS = 30_000
+
+# advanced_query results above this many documents are returned as NDJSON
+# pages, one TextContent of up to this many documents each
+RESULT_PAGE_SIZE = 500
+
+# Limits for the sample document in get_database_schema: longer strings and
+# lists are cut, deeper nesting is summarized
+SAMPLE_MAX_STRING = 200
+SAMPLE_MAX_LIST = 5
+SAMPLE_MAX_DEPTH = 3
+
+# Maximum number of fields profiled per $facet aggregation in get_available_fields
+FIELD_STATS_FACET_SIZE = 20
+
+# Indexes for the tools' filter shapes: the same definitions the import side
+# creates, so creating them against an imported collection is a no-op. Their
+# order is the order index_hint tries them in.
+MCP_INDEXES = config.MONGODB_INDEXES
+TOTAL_COST_INDEX = "app_env_owner_date_cost"
+
+# Records which one-off data migrations have run, one document per migration
+MIGRATIONS_COLLECTION = "schema_migrations"
+COST_MIGRATION_ID = f"{MONGODB_COLLECTION}.numeric_cost"
+HEATMAP_INDEX = "environment_1_applicationName_1"
+
 # Initialize MCP server
 app = Server("mongodb-azure-analytics")
 
-# MongoDB client (initialized when needed)
-_mongodb_client = None
+# MongoDB client and collection handle per event loop (created on first use, then
+# reused); the lock makes creation atomic when loops run in several threads
+_loop_clients = {}
+_client_lock = threading.Lock()
+
+# Loops that run for the life of the process (the server's, run_tool's); only
+# their clients keep idle connections open (minPoolSize)
+_long_lived_loops = set()
+
+# Event loop thread shared by synchronous callers of run_tool
+_tool_loop = None
+_tool_loop_lock = threading.Lock()
+
+
+def _loop_client() -> tuple:
+    """(client, collection) for the running event loop, created once per loop"""
+    loop = asyncio.get_running_loop()
+    entry = _loop_clients.get(loop)
+    if entry is None:
+        with _client_lock:
+            entry = _loop_clients.get(loop)
+            if entry is None:
+                for old_loop in [old for old in _loop_clients if old.is_closed()]:
+                    # Its loop is gone, so the client can no longer be closed cleanly
+                    logger.warning(
+                        "MongoDB client of a finished event loop was not closed; "
+                        "call tools through run_tool() or await close_loop_client() before the loop ends"
+                    )
+                    del _loop_clients[old_loop]
+                options = dict(MONGODB_CLIENT_OPTIONS)
+                if loop not in _long_lived_loops:
+                    options["minPoolSize"] = 0  # No warm connections for a client used by one loop only
+                client = AsyncMongoClient(MONGODB_URI, **options)
+                entry = _loop_clients[loop] = (client, client[MONGODB_DATABASE][MONGODB_COLLECTION])
+    return entry
+
+
+async def close_loop_client():
+    """Close the running event loop's client, if it has one (call before the loop ends)"""
+    with _client_lock:
+        entry = _loop_clients.pop(asyncio.get_running_loop(), None)
+    if entry is not None:
+        await entry[0].close()
+
+
+def _get_tool_loop():
+    """Start the shared tool loop in a daemon thread on first use"""
+    global _tool_loop
+    with _tool_loop_lock:
+        if _tool_loop is None:
+            loop = asyncio.new_event_loop()
+            _long_lived_loops.add(loop)
+            threading.Thread(target=loop.run_forever, name="mcp-tool-loop", daemon=True).start()
+            atexit.register(_stop_tool_loop, loop)
+            asyncio.run_coroutine_threadsafe(prepare_collection(), loop).result()
+            _tool_loop = loop
+    return _tool_loop
+
+
+def _stop_tool_loop(loop):
+    """Close the tool loop's client and stop the loop (at interpreter exit)"""
+    try:
+        asyncio.run_coroutine_threadsafe(close_loop_client(), loop).result(timeout=5)
+    except Exception as e:
+        logger.debug(f"Error closing the tool loop's MongoDB client: {e}")
+    loop.call_soon_threadsafe(loop.stop)
+
+
+def run_tool(coro):
+    """
+    Run a tool coroutine from synchronous code and return its result.
+
+    All calls share one long-lived event loop thread, and so one client and
+    connection pool, instead of a new loop and client per asyncio.run().
+    Safe to call from several threads (e.g. Streamlit script runs).
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_tool_loop()).result()
 
 
 def get_mongodb_client():
-    """Get MongoDB client instance"""
-    global _mongodb_client
-    if _mongodb_client is None:
-        _mongodb_client = MongoClient(MONGODB_URI)
-    return _mongodb_client
+    """
+    Get MongoDB client instance.
+
+    The client is PyMongo's native asyncio client: tool handlers await their
+    queries on the event loop, so concurrent tool calls overlap without
+    worker threads. An async client only works on the loop it was first used
+    on, so each event loop gets its own client: the MCP server runs one loop
+    and keeps one client, and synchronous callers (the Streamlit AI
+    assistant) share the loop behind run_tool. Must be called from a
+    coroutine.
+    """
+    return _loop_client()[0]
 
 
 def get_collection():
-    """Get MongoDB collection"""
-    client = get_mongodb_client()
-    db = client[MONGODB_DATABASE]
-    return db[MONGODB_COLLECTION]
+    """Get MongoDB collection (one handle per event loop, shared by all tool calls on it)"""
+    return _loop_client()[1]
+
+
+# Tool result caches, one per decorated tool: (database, collection, args) -> (timestamp, version, result)
+_caches = []
+
+# Collection versions: (database, collection) -> (timestamp, version)
+_collection_versions = {}
+
+
+async def collection_version(collection) -> tuple:
+    """
+    Cheap fingerprint of the collection contents: (estimated count, newest _id).
+
+    Reused for COLLECTION_VERSION_TTL_SECONDS, so a burst of cached tool
+    calls costs one version check instead of one per call.
+    """
+    key = (collection.database.name, collection.name)
+    now = time.monotonic()
+    checked = _collection_versions.get(key)
+    if checked is not None and now - checked[0] < COLLECTION_VERSION_TTL_SECONDS:
+        return checked[1]
+
+    count, newest = await asyncio.gather(
+        collection.estimated_document_count(),
+        collection.find_one({}, projection={"_id": 1}, sort=[("_id", -1)])
+    )
+    version = count, newest["_id"] if newest else None
+    _collection_versions[key] = (now, version)
+    return version
+
+
+class ErrorResult(list):
+    """A tool result reporting an error, in full or for part of it; cached() never stores these"""
+
+
+def error_result(payload: dict) -> ErrorResult:
+    """Build a tool result for an error payload such as {"error": ...}"""
+    return ErrorResult([TextContent(type="text", text=_dump(payload))])
+
+
+def cached(func=None, *, ttl: float = None, maxsize: int = None):
+    """
+    Cache a tool's result per collection, arguments and collection version.
+
+    An import or deletion changes the collection version (see
+    collection_version) and so invalidates entries. With `ttl`, entries are
+    also reused for at most that many seconds; with `maxsize`, the least
+    recently used entries are evicted beyond that many. Error results
+    (ErrorResult) are not stored. Arguments may hold filter dicts, so they
+    are keyed by their JSON with sorted keys. Use as @cached or
+    @cached(ttl=..., maxsize=...).
+    """
+    if func is None:
+        return functools.partial(cached, ttl=ttl, maxsize=maxsize)
+
+    cache = OrderedDict()
+    _caches.append(cache)
+
+    @functools.wraps(func)
+    async def wrapper(*args):
+        version = await collection_version(get_collection())
+        args_key = orjson.dumps(args, default=_json_default, option=orjson.OPT_SORT_KEYS)
+        key = (MONGODB_DATABASE, MONGODB_COLLECTION, args_key)
+        now = time.monotonic()
+        entry = cache.get(key)
+        if entry is not None and entry[1] == version and (ttl is None or now - entry[0] < ttl):
+            cache.move_to_end(key)
+            return entry[2]
+
+        result = await func(*args)
+        if isinstance(result, ErrorResult):
+            return result
+
+        cache[key] = (now, version, result)
+        cache.move_to_end(key)
+        if maxsize is not None and len(cache) > maxsize:
+            cache.popitem(last=False)
+        return result
+
+    return wrapper
+
+
+_DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+# One compact document per line (NDJSON pages, streamed result lists)
+_COMPACT_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _json_default(obj):
+    """orjson fallback for BSON values it does not know (ObjectId first: by far the most common)"""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, (bytes, Binary)):
+        return base64.b64encode(obj).decode()
+    return str(obj)
+
+
+def _dump(obj) -> str:
+    """
+    Serialize a tool response as indented JSON.
+
+    orjson handles datetimes, numpy values and non-string keys natively and
+    is several times faster than the stdlib json module on large query
+    results; BSON types go through _json_default.
+    """
+    return orjson.dumps(obj, default=_json_default, option=_DUMP_OPTIONS).decode()
+
+
+async def dump_streamed(head: dict, cursor) -> str:
+    """
+    Serialize a response of the form {**head, "results": [...], "count": n} from a cursor.
+
+    Documents are encoded one at a time into a single buffer as the cursor
+    yields them, so the result list is never held alongside its JSON text.
+    Each document takes one compact line inside the indented response.
+    """
+    buf = bytearray(b"{\n")
+    for key, value in head.items():
+        buf += b"  " + orjson.dumps(key) + b": "
+        buf += orjson.dumps(value, default=_json_default, option=_COMPACT_OPTIONS) + b",\n"
+    buf += b'  "results": ['
+    count = 0
+    async for doc in cursor:
+        buf += b",\n    " if count else b"\n    "
+        buf += orjson.dumps(doc, default=_json_default, option=_COMPACT_OPTIONS)
+        count += 1
+    buf += b"\n  ]" if count else b"]"
+    buf += b',\n  "count": ' + str(count).encode() + b"\n}"
+    return buf.decode()
+
+
+# One render at a time: the persistent Kaleido renderer is a single browser process.
+# A thread lock, taken in the render thread, so it also holds across the event
+# loops of callers that run each tool call in its own asyncio.run (Streamlit).
+_render_lock = threading.Lock()
+
+# Whether the persistent renderer is running; None until first attempted
+_renderer_started = None
+_renderer_lock = threading.Lock()
+
+
+# Image formats chart tools can render with Kaleido, and their MIME types
+CHART_IMAGE_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
+
+
+async def render_image(fig, image_format: str = "png") -> str:
+    """
+    Render a Plotly figure to a base64-encoded image.
+
+    The render runs in a worker thread so a chart being drawn does not hold
+    up other tool calls on the event loop.
+    """
+    image = await asyncio.to_thread(_render_image_sync, fig, image_format)
+    return base64.b64encode(image).decode()
+
+
+def _render_image_sync(fig, image_format: str) -> bytes:
+    """Render under _render_lock, starting the persistent renderer on first use"""
+    ensure_chart_renderer()
+    with _render_lock:
+        return pio.to_image(fig, format=image_format)
+
+
+async def chart_content(fig, output_format: str = "png") -> list[TextContent | ImageContent]:
+    """
+    Tool result for a chart: the Plotly figure JSON, or an image rendered by Kaleido.
+
+    "json" skips the browser render entirely; clients that draw Plotly
+    figures themselves get the chart in milliseconds.
+
+    Raises:
+        ValueError: If output_format is not json, svg or png
+    """
+    if output_format == "json":
+        return [TextContent(type="text", text=fig.to_json())]
+    if output_format not in CHART_IMAGE_TYPES:
+        raise ValueError(f"Unsupported chart format: {output_format!r} (use png, svg or json)")
+    return [ImageContent(
+        type="image",
+        data=await render_image(fig, output_format),
+        mimeType=CHART_IMAGE_TYPES[output_format]
+    )]
+
+
+def start_chart_renderer() -> bool:
+    """
+    Keep one Kaleido browser process running for all chart renders.
+
+    Kaleido 1.x otherwise launches and tears down Chromium on every
+    pio.to_image call. Older Kaleido releases already keep their own
+    subprocess alive, so there is nothing to start for them.
+
+    Returns:
+        True if a persistent renderer was started
+    """
+    try:
+        import kaleido
+    except ImportError:
+        logger.warning("Kaleido is not installed, chart tools will fail")
+        return False
+
+    if not hasattr(kaleido, "start_sync_server"):
+        return False
+
+    try:
+        kaleido.start_sync_server()
+        return True
+    except Exception as e:
+        logger.warning(f"Could not start persistent chart renderer, rendering per call: {e}")
+        return False
+
+
+def ensure_chart_renderer() -> bool:
+    """
+    Start the persistent renderer once per process, whoever renders first.
+
+    Covers callers that import this module without running main() (the
+    Streamlit Home page). The renderer is stopped at interpreter exit.
+
+    Returns:
+        True if a persistent renderer is running
+    """
+    global _renderer_started
+    with _renderer_lock:
+        if _renderer_started is None:
+            _renderer_started = start_chart_renderer()
+            if _renderer_started:
+                atexit.register(stop_chart_renderer)
+        return _renderer_started
+
+
+def stop_chart_renderer():
+    """Stop the persistent Kaleido process started by start_chart_renderer"""
+    try:
+        import kaleido
+        if hasattr(kaleido, "stop_sync_server"):
+            kaleido.stop_sync_server()
+    except Exception as e:
+        logger.debug(f"Error stopping chart renderer: {e}")
+
+
+# Names of MCP_INDEXES known to exist (only these are used as hints)
+_available_indexes = set()
+
+
+async def ensure_indexes():
+    """Create MCP_INDEXES on the collection (called once at startup)"""
+    collection = get_collection()
+    for index in MCP_INDEXES:
+        name = index.document["name"]
+        try:
+            await collection.create_indexes([index])
+            _available_indexes.add(name)
+        except Exception as e:
+            logger.warning(f"Could not create index {name} (may already exist with other options): {e}")
+
+
+async def migrate_cost_values() -> int:
+    """
+    Store string costs as numbers (one-off, see ensure_cost_migration).
+
+    Older imports kept cost exactly as read from Excel, sometimes as text.
+    Converting once lets aggregations $sum/$avg the field directly instead
+    of coercing every document on every call. Strings that are not numbers
+    are left as they are (and ignored by the numeric accumulators).
+
+    Returns:
+        Number of documents updated
+    """
+    collection = get_collection()
+    result = await collection.update_many(
+        {"cost": {"$type": "string"}},
+        [{"$set": {"cost": {"$convert": {
+            "input": {"$trim": {"input": "$cost"}},
+            "to": "double",
+            "onError": "$cost"
+        }}}}]
+    )
+    if result.modified_count:
+        logger.info(f"Converted {result.modified_count} string cost values to numbers")
+    return result.modified_count
+
+
+async def ensure_cost_migration(force: bool = False) -> int:
+    """
+    Run migrate_cost_values once per collection and record that it ran.
+
+    The update cannot use an index, so it scans the whole collection; the
+    record in MIGRATIONS_COLLECTION makes later starts skip it. Imports
+    store numeric costs themselves, so new data needs no migration.
+
+    Args:
+        force: Run even if the migration is recorded (--migrate-costs)
+
+    Returns:
+        Number of documents updated
+    """
+    markers = get_mongodb_client()[MONGODB_DATABASE][MIGRATIONS_COLLECTION]
+    if not force and await markers.find_one({"_id": COST_MIGRATION_ID}) is not None:
+        return 0
+
+    modified = await migrate_cost_values()
+    await markers.update_one(
+        {"_id": COST_MIGRATION_ID},
+        {"$set": {"ranAt": datetime.utcnow(), "modified": modified}},
+        upsert=True
+    )
+    return modified
+
+
+async def prepare_collection():
+    """Index and migrate the collection on first connect (server start or first run_tool call)"""
+    try:
+        await ensure_indexes()
+    except Exception as e:
+        logger.warning(f"Skipping index setup, MongoDB not reachable: {e}")
+
+    try:
+        await ensure_cost_migration()
+    except Exception as e:
+        logger.warning(f"Cost migration failed, costs stored as text are left out of totals: {e}")
+
+
+def index_hint(match: dict, fields: list = None):
+    """
+    Pick an index for a filter: the first of MCP_INDEXES whose leading field
+    is an equality in the filter. Returns the index name, or None to let the
+    query planner decide.
+
+    With `fields` (the projected fields of a query that excludes _id), an
+    index holding every filtered and projected field is preferred: the query
+    is then covered, answered from index keys without fetching documents.
+    """
+    if not match:
+        return None
+
+    first = None
+
+    for index in MCP_INDEXES:
+        name = index.document["name"]
+        if name not in _available_indexes:
+            continue
+
+        leading = next(iter(index.document["key"]))
+        value = match.get(leading)
+        if value is None or isinstance(value, (dict, list)):
+            continue
+        # The partial index only covers non-empty string application names
+        if "partialFilterExpression" in index.document and not (isinstance(value, str) and value):
+            continue
+        if not fields:
+            return name
+
+        keys = index.document["key"]
+        if all(field in keys for field in match) and all(field in keys for field in fields):
+            return name
+        if first is None:
+            first = name
+
+    return first
+
+
+def group_index_hint(field: str):
+    """
+    Name of an available index led by `field` that holds every document, or None.
+
+    A count-by-field pipeline that only projects the grouping field can then
+    be answered by scanning that index instead of the documents. Partial
+    indexes are skipped, since they leave documents out of the count.
+    """
+    for index in MCP_INDEXES:
+        name = index.document["name"]
+        if (name in _available_indexes and "partialFilterExpression" not in index.document
+                and next(iter(index.document["key"])) == field):
+            return name
+    return None
+
+
+async def iter_aggregate(collection, pipeline: list, hint: str = None, allow_disk_use: bool = None,
+                         batch_size: int = CURSOR_BATCH_SIZE):
+    """
+    Start an aggregation and return its cursor, for callers that consume results in one pass
+
+    Args:
+        collection: Collection to aggregate
+        pipeline: Aggregation pipeline
+        hint: Optional index name to use
+        allow_disk_use: Optional allowDiskUse setting (server default if None)
+        batch_size: Documents per cursor batch; pass the pipeline's $limit so
+            the whole result arrives in the first reply
+
+    Returns:
+        Command cursor over the results
+    """
+    options = {"batchSize": batch_size, "maxTimeMS": AGGREGATE_MAX_TIME_MS}
+    if hint:
+        options["hint"] = hint
+    if allow_disk_use is not None:
+        options["allowDiskUse"] = allow_disk_use
+    return await collection.aggregate(pipeline, **options)
+
+
+async def fetch_aggregate(collection, pipeline: list, hint: str = None, allow_disk_use: bool = None,
+                          batch_size: int = CURSOR_BATCH_SIZE) -> list:
+    """Run an aggregation and return all results"""
+    cursor = await iter_aggregate(collection, pipeline, hint, allow_disk_use, batch_size)
+    return await cursor.to_list()
+
+
+def is_field_path(field) -> bool:
+    """
+    Check that a field name from a tool argument is a plain dotted path:
+    no empty segments, no "$" operators or variables, no NUL bytes.
+    Other punctuation is allowed (tag-derived field names can contain it).
+    """
+    return isinstance(field, str) and "\0" not in field and all(
+        part and not part.startswith("$") for part in field.split(".")
+    )
+
+
+def group_projection(*fields: str) -> dict:
+    """
+    $project stage keeping only the fields a $group reads, so it works on small documents
+
+    Fields nested under another listed field are covered by their parent
+    (projecting both "tags" and "tags.raw" is a path collision). Field names
+    come from tool arguments, so each is checked with is_field_path.
+
+    Raises:
+        ValueError: If a field name is not a plain field path
+    """
+    for field in fields:
+        if not is_field_path(field):
+            raise ValueError(f"Invalid field name: {field!r}")
+
+    kept = [f for f in dict.fromkeys(fields) if not any(f.startswith(other + ".") for other in fields)]
+    return {"$project": {"_id": 0, **{f: 1 for f in kept}}}
+
+
+def unknown_label(value) -> dict:
+    """Aggregation expression for `value or "Unknown"` (null/empty values become "Unknown")"""
+    return {"$cond": [{"$in": [value, [None, "", 0, False]]}, "Unknown", value]}
+
+
+def present_values(array) -> dict:
+    """Aggregation expression keeping only the truthy (non-null, non-empty) entries of an array"""
+    return {"$filter": {"input": array, "as": "v", "cond": {"$and": ["$$v", {"$ne": ["$$v", ""]}]}}}
+
+
+def dimension_values_pipeline(field: str, limit: int) -> list:
+    """Pipeline returning the first `limit` sorted labels of a field (null/empty values as "Unknown")"""
+    return [
+        group_projection(field),
+        {"$group": {"_id": unknown_label({"$ifNull": [f"${field}", None]})}},
+        {"$sort": {"_id": 1}},
+        {"$limit": limit}
+    ]
+
+
+def label_match_values(labels: list) -> list:
+    """Raw field values behind a list of labels ("Unknown" stands for null/empty values too)"""
+    if "Unknown" in labels:
+        return labels + [None, "", 0, False]
+    return labels
+
+
+def count_by_field_pipeline(field: str, limit: int, label_missing: bool = False) -> list:
+    """
+    Build a top-N count pipeline whose rows are already shaped as {field: value, "count": n}
+
+    Args:
+        field: Field to group by
+        limit: Maximum number of groups to return
+        label_missing: Report null/empty values as "Unknown" (for chart labels)
+
+    Returns:
+        Aggregation pipeline
+
+    Raises:
+        ValueError: If the field name is not a plain field path
+    """
+    value = unknown_label("$_id") if label_missing else "$_id"
+    return [
+        # Only the counted field reaches the grouping stage
+        group_projection(field),
+        # Same as $group + {$sort: {count: -1}}, as a single stage
+        {"$sortByCount": f"${field}"},
+        {"$limit": limit},
+        {"$project": {"_id": 0, field: value, "count": "$count"}}
+    ]
+
+
+async def run_concurrently(*queries) -> list:
+    """
+    Run independent driver queries at the same time.
+
+    Each query is an awaitable on the shared client, which pools
+    connections, so a tool waits for the slowest query instead of the sum
+    of all of them.
+
+    Returns:
+        The queries' results, in argument order
+    """
+    return list(await asyncio.gather(*queries))
+
+
+def clear_cache():
+    """Drop all cached tool results and charts (e.g. after new data is imported)"""
+    for cache in _caches:
+        cache.clear()
+    _collection_versions.clear()
 
 
 @app.list_tools()
@@ -83,11 +749,15 @@ async def list_tools() -> list[Tool]:
                         "type": "object",
                         "description": "Dictionary of field:value pairs to filter by (e.g., {'primaryContact': 'john', 'department': 'IT'})"
                     },
-                    "limit": {"type": "integer", "description": "Maximum number of results (default: 100)"},
+                    "limit": {"type": "integer", "description": "Maximum number of results (default: 100). Above 500, results come as NDJSON pages after a summary"},
                     "fields_to_return": {
                         "type": "array",
                         "items": {"type": "string"},
                         "description": "List of fields to return in results (default: all fields)"
+                    },
+                    "count_only": {
+                        "type": "boolean",
+                        "description": "Return only the number of matching documents, without the documents (default: false)"
                     }
                 },
                 "required": ["filters"]
@@ -95,7 +765,7 @@ async def list_tools() -> list[Tool]:
         ),
         Tool(
             name="query_resources",
-            description="Query Azure resources with filters. Returns matching documents.",
+            description="Query Azure resources with filters. Returns matching documents (without originalData unless requested).",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -103,7 +773,12 @@ async def list_tools() -> list[Tool]:
                     "environment": {"type": "string", "description": "Filter by environment (e.g., production, dev)"},
                     "owner": {"type": "string", "description": "Filter by owner"},
                     "cost": {"type": "string", "description": "Filter by cost"},
-                    "limit": {"type": "integer", "description": "Maximum number of results (default: 100)"}
+                    "limit": {"type": "integer", "description": "Maximum number of results (default: 100)"},
+                    "fields_to_return": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "List of fields to return in results (default: all fields except originalData)"
+                    }
                 },
                 "required": []
             }
@@ -216,7 +891,12 @@ async def list_tools() -> list[Tool]:
                         "description": "Field to create chart for"
                     },
                     "title": {"type": "string", "description": "Chart title"},
-                    "limit": {"type": "integer", "description": "Number of top items to show (default: 15)"}
+                    "limit": {"type": "integer", "description": "Number of top items to show (default: 15)"},
+                    "format": {
+                        "type": "string",
+                        "enum": ["png", "svg", "json"],
+                        "description": "Output: png or svg image, or Plotly figure JSON (fastest, no rendering) (default: png)"
+                    }
                 },
                 "required": ["field"]
             }
@@ -233,7 +913,12 @@ async def list_tools() -> list[Tool]:
                         "description": "Field to create pie chart for"
                     },
                     "title": {"type": "string", "description": "Chart title"},
-                    "limit": {"type": "integer", "description": "Number of top items to show (default: 10)"}
+                    "limit": {"type": "integer", "description": "Number of top items to show (default: 10)"},
+                    "format": {
+                        "type": "string",
+                        "enum": ["png", "svg", "json"],
+                        "description": "Output: png or svg image, or Plotly figure JSON (fastest, no rendering) (default: png)"
+                    }
                 },
                 "required": ["field"]
             }
@@ -244,7 +929,12 @@ async def list_tools() -> list[Tool]:
             inputSchema={
                 "type": "object",
                 "properties": {
-                    "title": {"type": "string", "description": "Chart title"}
+                    "title": {"type": "string", "description": "Chart title"},
+                    "format": {
+                        "type": "string",
+                        "enum": ["png", "svg", "json"],
+                        "description": "Output: png or svg image, or Plotly figure JSON (fastest, no rendering) (default: png)"
+                    }
                 },
                 "required": []
             }
@@ -292,7 +982,8 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent | ImageConte
             return await advanced_query(
                 arguments.get("filters", {}),
                 arguments.get("limit", 100),
-                arguments.get("fields_to_return")
+                arguments.get("fields_to_return"),
+                arguments.get("count_only", False)
             )
 
         elif name == "query_resources":
@@ -301,7 +992,8 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent | ImageConte
                 arguments.get("environment"),
                 arguments.get("owner"),
                 arguments.get("cost"),
-                arguments.get("limit", 100)
+                arguments.get("limit", 100),
+                arguments.get("fields_to_return")
             )
 
         elif name == "get_statistics":
@@ -341,19 +1033,22 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent | ImageConte
             return await create_bar_chart(
                 arguments["field"],
                 arguments.get("title"),
-                arguments.get("limit", 15)
+                arguments.get("limit", 15),
+                arguments.get("format", "png")
             )
 
         elif name == "create_pie_chart":
             return await create_pie_chart(
                 arguments["field"],
                 arguments.get("title"),
-                arguments.get("limit", 10)
+                arguments.get("limit", 10),
+                arguments.get("format", "png")
             )
 
         elif name == "create_environment_app_matrix":
             return await create_environment_app_matrix(
-                arguments.get("title")
+                arguments.get("title"),
+                arguments.get("format", "png")
             )
 
         elif name == "get_resources_by_owner":
@@ -383,16 +1078,43 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent | ImageConte
         )]
 
 
+def _shrink(obj, max_str: int = SAMPLE_MAX_STRING, max_list: int = SAMPLE_MAX_LIST,
+            depth: int = SAMPLE_MAX_DEPTH):
+    """
+    Truncate a document for display: strings to max_str characters, lists to
+    max_list items, and dicts/lists nested deeper than `depth` to a short
+    placeholder. Only the shape and typical values are needed in a schema.
+    """
+    if isinstance(obj, str):
+        return obj if len(obj) <= max_str else obj[:max_str] + "..."
+    if isinstance(obj, dict):
+        if depth <= 0:
+            return f"{{...{len(obj)} fields}}"
+        return {key: _shrink(value, max_str, max_list, depth - 1) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        if depth <= 0:
+            return f"[...{len(obj)} items]"
+        items = [_shrink(value, max_str, max_list, depth - 1) for value in obj[:max_list]]
+        if len(obj) > max_list:
+            items.append(f"...{len(obj) - max_list} more")
+        return items
+    return obj
+
+
+@cached(ttl=SCHEMA_CACHE_TTL_SECONDS)
 async def get_database_schema() -> list[TextContent]:
     """Get database schema information"""
     collection = get_collection()
 
-    # Get sample document
-    sample_doc = collection.find_one()
+    # Sample document (originalData omitted: it repeats every Excel column) and
+    # document count from collection metadata (no scan), fetched concurrently
+    sample_doc, total_documents = await run_concurrently(
+        collection.find_one({}, projection=DEFAULT_RESULT_PROJECTION),
+        collection.estimated_document_count()
+    )
 
-    # Get collection stats
     stats = {
-        "total_documents": collection.count_documents({}),
+        "total_documents": total_documents,
         "database": MONGODB_DATABASE,
         "collection": MONGODB_COLLECTION
     }
@@ -417,12 +1139,12 @@ async def get_database_schema() -> list[TextContent]:
                 "dataDate": "Date from Summary sheet (YYYY-MM format)"
             }
         },
-        "sample_document": sample_doc if sample_doc else "No documents found"
+        "sample_document": _shrink(sample_doc) if sample_doc else "No documents found"
     }
 
     return [TextContent(
         type="text",
-        text=json.dumps(schema_info, indent=2, default=str)
+        text=_dump(schema_info)
     )]
 
 
@@ -431,11 +1153,19 @@ async def query_resources(
     environment: str = None,
     owner: str = None,
     cost: str = None,
-    limit: int = 100
+    limit: int = 100,
+    fields_to_return: list = None
 ) -> list[TextContent]:
     """Query resources with filters"""
     collection = get_collection()
 
+    # Build projection: requested fields only, otherwise everything but originalData
+    if fields_to_return:
+        projection = {field: 1 for field in fields_to_return}
+        projection['_id'] = 0  # Exclude _id unless explicitly requested
+    else:
+        projection = DEFAULT_RESULT_PROJECTION
+
     # Build query
     query = {}
     if application_name:
@@ -445,46 +1175,83 @@ async def query_resources(
     if owner:
         query["owner"] = owner
     if cost:
-        query["cost"] = cost
+        # Costs are stored as numbers; rows whose cost was not numeric keep the text
+        try:
+            query["cost"] = {"$in": [float(cost), cost]}
+        except ValueError:
+            query["cost"] = cost
 
     # Execute query
-    results = list(collection.find(query).limit(limit))
-
-    # Format results
-    response = {
-        "query": query,
-        "count": len(results),
-        "results": results
-    }
+    cursor = collection.find(query, projection).limit(limit).batch_size(limit)
+    hint = index_hint(query, fields_to_return)
+    if hint:
+        cursor = cursor.hint(hint)
 
+    # Format results while reading the cursor
     return [TextContent(
         type="text",
-        text=json.dumps(response, indent=2, default=str)
+        text=await dump_streamed({"query": query}, cursor)
     )]
 
 
+async def _sample_values(collection, field: str, limit: int = 10) -> list:
+    """
+    Get the first few distinct non-empty string values of a field.
+
+    Runs outside $facet (whose sub-pipelines cannot use indexes) and sorts
+    on the field before grouping, so with an index on the field the server
+    walks distinct index keys instead of grouping every document, and only
+    `limit` values are returned.
+    """
+    pipeline = [
+        {"$match": {field: {"$gt": ""}}},
+        {"$sort": {field: 1}},
+        {"$group": {"_id": f"${field}"}},
+        {"$sort": {"_id": 1}},
+        {"$limit": limit}
+    ]
+    return [r["_id"] async for r in await collection.aggregate(pipeline)]
+
+
+@cached(ttl=CACHE_TTL_SECONDS)
 async def get_statistics() -> list[TextContent]:
     """Get database statistics (optimized to prevent context overflow)"""
     collection = get_collection()
 
-    # Get counts only, not full distinct lists to prevent huge responses
+    # Independent queries, run concurrently:
+    # - unique counts in one aggregation (counts only, not full distinct lists, to prevent huge responses)
+    # - date range from the date index (outside $facet, which cannot use indexes)
+    total_documents, unique_counts, earliest, latest, sample_environments, sample_applications = await run_concurrently(
+        collection.estimated_document_count(),
+        fetch_aggregate(collection, [{"$facet": {
+            "applicationName": _field_stats_facet("applicationName"),
+            "environment": _field_stats_facet("environment"),
+            "owner": _field_stats_facet("owner")
+        }}]),
+        collection.find_one({}, projection={"date": 1}, sort=[("date", ASCENDING)]),
+        collection.find_one({}, projection={"date": 1}, sort=[("date", -1)]),
+        _sample_values(collection, "environment"),
+        _sample_values(collection, "applicationName")
+    )
+    result = unique_counts[0] if unique_counts else {}
+
     stats = {
-        "total_documents": collection.count_documents({}),
-        "unique_applications": len(collection.distinct("applicationName")),
-        "unique_environments": len(collection.distinct("environment")),
-        "unique_owners": len(collection.distinct("owner")),
+        "total_documents": total_documents,
+        "unique_applications": _field_stats_result(result.get("applicationName"))["unique_values"],
+        "unique_environments": _field_stats_result(result.get("environment"))["unique_values"],
+        "unique_owners": _field_stats_result(result.get("owner"))["unique_values"],
         "date_range": {
-            "earliest": collection.find_one({}, sort=[("date", 1)]).get("date") if collection.count_documents({}) > 0 else None,
-            "latest": collection.find_one({}, sort=[("date", -1)]).get("date") if collection.count_documents({}) > 0 else None
+            "earliest": earliest.get("date") if earliest else None,
+            "latest": latest.get("date") if latest else None
         },
-        "sample_environments": collection.distinct("environment")[:10],  # Only first 10 as samples
-        "sample_applications": collection.distinct("applicationName")[:10],  # Only first 10 as samples
+        "sample_environments": sample_environments,
+        "sample_applications": sample_applications,
         "note": "Use get_available_fields for full field lists, or aggregate_by_any_field for detailed breakdowns"
     }
 
     return [TextContent(
         type="text",
-        text=json.dumps(stats, indent=2, default=str)
+        text=_dump(stats)
     )]
 
 
@@ -492,189 +1259,154 @@ async def aggregate_by_field(field: str, limit: int = 20) -> list[TextContent]:
     """Aggregate documents by field"""
     collection = get_collection()
 
-    pipeline = [
-        {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
-        {"$sort": {"count": -1}},
-        {"$limit": limit}
-    ]
-
-    results = list(collection.aggregate(pipeline))
+    pipeline = count_by_field_pipeline(field, limit)
 
-    # Format results
-    formatted_results = [
-        {field: r["_id"], "count": r["count"]}
-        for r in results
-    ]
+    # Already shaped as {field: value, "count": n} by the $project stage
+    results = await fetch_aggregate(collection, pipeline, batch_size=limit)
 
     return [TextContent(
         type="text",
-        text=json.dumps({
+        text=_dump({
             "field": field,
-            "results": formatted_results,
+            "results": results,
             "total_groups": len(results)
-        }, indent=2)
+        })
     )]
 
 
-async def create_bar_chart(field: str, title: str = None, limit: int = 15) -> list[ImageContent]:
+def chart_series(rows: list, field: str) -> tuple[list, list]:
+    """
+    Split count rows into label and count lists for a Plotly trace.
+
+    Charts have at most a few dozen points, so they are fed plain lists
+    rather than a DataFrame. Labels are strings: keeps mixed-type keys
+    (e.g. cost) from becoming numeric or categorical axes.
+    """
+    return [str(r[field]) for r in rows], [r["count"] for r in rows]
+
+
+@cached(maxsize=CHART_CACHE_SIZE)
+async def create_bar_chart(field: str, title: str = None, limit: int = 15,
+                           output_format: str = "png") -> list[ImageContent]:
     """Create a bar chart"""
     collection = get_collection()
 
     # Get aggregated data
-    pipeline = [
-        {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
-        {"$sort": {"count": -1}},
-        {"$limit": limit}
-    ]
-
-    results = list(collection.aggregate(pipeline))
+    pipeline = count_by_field_pipeline(field, limit, label_missing=True)
 
-    # Create DataFrame
-    df = pd.DataFrame([
-        {field: r["_id"] or "Unknown", "count": r["count"]}
-        for r in results
-    ])
+    labels, counts = chart_series(await fetch_aggregate(collection, pipeline, batch_size=limit), field)
 
     # Create bar chart
     if title is None:
         title = f"Resources by {field.replace('Name', ' Name')}"
 
-    fig = px.bar(
-        df,
-        x=field,
-        y="count",
-        title=title,
-        labels={field: field.replace("Name", " Name"), "count": "Number of Resources"},
-        color="count",
-        color_continuous_scale="Blues"
-    )
+    fig = go.Figure(go.Bar(
+        x=labels,
+        y=counts,
+        marker={
+            "color": counts,
+            "colorscale": "Blues",
+            "showscale": True,
+            "colorbar": {"title": {"text": "Number of Resources"}}
+        }
+    ))
 
     fig.update_layout(
+        title=title,
+        xaxis_title=field.replace("Name", " Name"),
+        yaxis_title="Number of Resources",
+        xaxis_type="category",
         xaxis_tickangle=-45,
         height=500,
         showlegend=False
     )
 
-    # Convert to PNG
-    img_bytes = pio.to_image(fig, format="png")
-    import base64
-    img_base64 = base64.b64encode(img_bytes).decode()
-
-    return [ImageContent(
-        type="image",
-        data=img_base64,
-        mimeType="image/png"
-    )]
+    return await chart_content(fig, output_format)
 
 
-async def create_pie_chart(field: str, title: str = None, limit: int = 10) -> list[ImageContent]:
+@cached(maxsize=CHART_CACHE_SIZE)
+async def create_pie_chart(field: str, title: str = None, limit: int = 10,
+                           output_format: str = "png") -> list[ImageContent]:
     """Create a pie chart"""
     collection = get_collection()
 
     # Get aggregated data
-    pipeline = [
-        {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
-        {"$sort": {"count": -1}},
-        {"$limit": limit}
-    ]
+    pipeline = count_by_field_pipeline(field, limit, label_missing=True)
 
-    results = list(collection.aggregate(pipeline))
-
-    # Create DataFrame
-    df = pd.DataFrame([
-        {field: r["_id"] or "Unknown", "count": r["count"]}
-        for r in results
-    ])
+    labels, counts = chart_series(await fetch_aggregate(collection, pipeline, batch_size=limit), field)
 
     # Create pie chart
     if title is None:
         title = f"Distribution by {field.replace('Name', ' Name')}"
 
-    fig = px.pie(
-        df,
-        values="count",
-        names=field,
-        title=title
-    )
+    fig = go.Figure(go.Pie(labels=labels, values=counts))
 
     fig.update_traces(textposition='inside', textinfo='percent+label')
-    fig.update_layout(height=500)
+    fig.update_layout(title=title, height=500)
 
-    # Convert to PNG
-    img_bytes = pio.to_image(fig, format="png")
-    import base64
-    img_base64 = base64.b64encode(img_bytes).decode()
-
-    return [ImageContent(
-        type="image",
-        data=img_base64,
-        mimeType="image/png"
-    )]
+    return await chart_content(fig, output_format)
 
 
-async def create_environment_app_matrix(title: str = None) -> list[ImageContent]:
+@cached(maxsize=CHART_CACHE_SIZE)
+async def create_environment_app_matrix(title: str = None, output_format: str = "png") -> list[ImageContent]:
     """Create a heatmap of applications across environments"""
     collection = get_collection()
 
-    # Get data
+    # Get data (rows without app or env are skipped before grouping; both
+    # fields are keys of HEATMAP_INDEX, so the match and group are covered by it)
     pipeline = [
+        {"$match": {
+            "applicationName": {"$gt": ""},
+            "environment": {"$nin": [None, ""]}
+        }},
+        group_projection("applicationName", "environment"),
         {"$group": {
             "_id": {
                 "app": "$applicationName",
                 "env": "$environment"
             },
             "count": {"$sum": 1}
-        }}
+        }},
+        # One row per application holding its per-environment counts
+        {"$group": {
+            "_id": "$_id.app",
+            "envs": {"$push": {"k": "$_id.env", "v": "$count"}}
+        }},
+        {"$sort": {"_id": 1}}
     ]
 
-    results = list(collection.aggregate(pipeline))
-
-    # Create DataFrame
-    data = []
-    for r in results:
-        if r["_id"]["app"] and r["_id"]["env"]:
-            data.append({
-                "Application": r["_id"]["app"],
-                "Environment": r["_id"]["env"],
-                "Count": r["count"]
-            })
-
-    df = pd.DataFrame(data)
+    hint = HEATMAP_INDEX if HEATMAP_INDEX in _available_indexes else None
+    results = await fetch_aggregate(collection, pipeline, hint)
 
-    if df.empty:
+    if not results:
         return [TextContent(type="text", text="No data available for heatmap")]
 
-    # Pivot for heatmap
-    pivot_df = df.pivot_table(
-        values="Count",
-        index="Application",
-        columns="Environment",
-        fill_value=0
-    )
+    # Count matrix: rows are the (already sorted) application rows, columns the
+    # sorted environments; pairs the server did not return stay 0
+    apps = [r["_id"] for r in results]
+    envs = sorted({e["k"] for r in results for e in r["envs"]})
+    env_index = {env: j for j, env in enumerate(envs)}
+    matrix = np.zeros((len(apps), len(envs)), dtype=np.int64)
+    for i, r in enumerate(results):
+        for e in r["envs"]:
+            matrix[i, env_index[e["k"]]] = e["v"]
 
     # Create heatmap
     if title is None:
         title = "Application Distribution Across Environments"
 
     fig = px.imshow(
-        pivot_df,
+        matrix,
+        x=envs,
+        y=apps,
         labels=dict(x="Environment", y="Application", color="Count"),
         title=title,
         color_continuous_scale="YlOrRd"
     )
 
-    fig.update_layout(height=max(500, len(pivot_df) * 20))
+    fig.update_layout(height=max(500, len(apps) * 20))
 
-    # Convert to PNG
-    img_bytes = pio.to_image(fig, format="png")
-    import base64
-    img_base64 = base64.b64encode(img_bytes).decode()
-
-    return [ImageContent(
-        type="image",
-        data=img_base64,
-        mimeType="image/png"
-    )]
+    return await chart_content(fig, output_format)
 
 
 async def get_resources_by_owner(limit: int = 10) -> list[TextContent]:
@@ -689,29 +1421,31 @@ async def get_resources_by_owner(limit: int = 10) -> list[TextContent]:
             "environments": {"$addToSet": "$environment"}
         }},
         {"$sort": {"count": -1}},
-        {"$limit": limit}
+        {"$limit": limit},
+        # Drop null/empty entries and shape the output on the server
+        {"$addFields": {
+            "applications": present_values("$applications"),
+            "environments": present_values("$environments")
+        }},
+        {"$project": {
+            "_id": 0,
+            "owner": unknown_label("$_id"),
+            "total_resources": "$count",
+            "unique_applications": {"$size": "$applications"},
+            "unique_environments": {"$size": "$environments"},
+            "applications": "$applications",
+            "environments": "$environments"
+        }}
     ]
 
-    results = list(collection.aggregate(pipeline))
-
-    # Format results
-    owner_breakdown = []
-    for r in results:
-        owner_breakdown.append({
-            "owner": r["_id"] or "Unknown",
-            "total_resources": r["count"],
-            "unique_applications": len([a for a in r["applications"] if a]),
-            "unique_environments": len([e for e in r["environments"] if e]),
-            "applications": [a for a in r["applications"] if a],
-            "environments": [e for e in r["environments"] if e]
-        })
+    owner_breakdown = await fetch_aggregate(collection, pipeline, batch_size=limit)
 
     return [TextContent(
         type="text",
-        text=json.dumps({
+        text=_dump({
             "owner_breakdown": owner_breakdown,
-            "total_owners": len(results)
-        }, indent=2)
+            "total_owners": len(owner_breakdown)
+        })
     )]
 
 
@@ -725,7 +1459,8 @@ async def get_total_cost(
     Calculate total cost with optional filters for environment, application name, owner, and date.
 
     Uses MongoDB aggregation pipeline to sum all cost values matching the filters.
-    Handles both numeric and string cost values by attempting to convert them.
+    Costs are stored as numbers (imports convert them, and older data is converted
+    on first connect by ensure_cost_migration), so they are summed as-is.
 
     Args:
         application_name: Filter by application name
@@ -753,33 +1488,24 @@ async def get_total_cost(
     if match_stage:
         pipeline.append({"$match": match_stage})
 
-    # Add stage to convert cost to numeric and sum
-    pipeline.extend([
-        {
-            "$addFields": {
-                "numericCost": {
-                    "$cond": {
-                        "if": {"$eq": [{"$type": "$cost"}, "string"]},
-                        "then": {"$toDouble": {"$ifNull": ["$cost", "0"]}},
-                        "else": {"$ifNull": ["$cost", 0]}
-                    }
-                }
-            }
-        },
-        {
-            "$group": {
-                "_id": None,
-                "totalCost": {"$sum": "$numericCost"},
-                "count": {"$sum": 1},
-                "avgCost": {"$avg": "$numericCost"},
-                "minCost": {"$min": "$numericCost"},
-                "maxCost": {"$max": "$numericCost"}
-            }
+    pipeline.append({
+        "$group": {
+            "_id": None,
+            "totalCost": {"$sum": "$cost"},
+            "count": {"$sum": 1},
+            "avgCost": {"$avg": "$cost"},
+            "minCost": {"$min": "$cost"},
+            "maxCost": {"$max": "$cost"}
         }
-    ])
+    })
 
     try:
-        results = list(collection.aggregate(pipeline))
+        # With applicationName fixed, the cost index answers the whole pipeline
+        if application_name and TOTAL_COST_INDEX in _available_indexes:
+            hint = TOTAL_COST_INDEX
+        else:
+            hint = index_hint(match_stage)
+        results = await fetch_aggregate(collection, pipeline, hint)
 
         if results:
             result = results[0]
@@ -790,11 +1516,11 @@ async def get_total_cost(
                     "owner": owner,
                     "date": date
                 },
-                "totalCost": result.get("totalCost", 0),
+                "totalCost": result.get("totalCost") or 0,
                 "resourceCount": result.get("count", 0),
-                "averageCost": result.get("avgCost", 0),
-                "minCost": result.get("minCost", 0),
-                "maxCost": result.get("maxCost", 0)
+                "averageCost": result.get("avgCost") or 0,
+                "minCost": result.get("minCost") or 0,
+                "maxCost": result.get("maxCost") or 0
             }
         else:
             response = {
@@ -814,36 +1540,76 @@ async def get_total_cost(
 
         return [TextContent(
             type="text",
-            text=json.dumps(response, indent=2)
+            text=_dump(response)
         )]
 
     except Exception as e:
         logger.error(f"Error calculating total cost: {e}")
-        return [TextContent(
-            type="text",
-            text=json.dumps({
-                "error": str(e),
-                "filters": {
-                    "applicationName": application_name,
-                    "environment": environment,
-                    "owner": owner,
-                    "date": date
-                }
-            }, indent=2)
-        )]
+        return error_result({
+            "error": str(e),
+            "filters": {
+                "applicationName": application_name,
+                "environment": environment,
+                "owner": owner,
+                "date": date
+            }
+        })
+
+
+def _field_stats_facet(field: str) -> list:
+    """
+    $facet branch counting unique values and non-null documents of a field.
+
+    Counts match len(distinct(field)) and count_documents({field: {"$ne": None}}):
+    an explicit null is a distinct value, a missing field is not.
+    """
+    return [
+        {"$group": {
+            "_id": f"${field}",
+            "docs": {"$sum": 1},
+            "nulls": {"$sum": {"$cond": [{"$eq": [{"$type": f"${field}"}, "null"]}, 1, 0]}}
+        }},
+        {"$group": {
+            "_id": None,
+            "unique": {"$sum": {"$cond": [
+                {"$or": [{"$ne": ["$_id", None]}, {"$gt": ["$nulls", 0]}]}, 1, 0
+            ]}},
+            "nonNull": {"$sum": {"$cond": [{"$ne": ["$_id", None]}, "$docs", 0]}}
+        }}
+    ]
 
 
+def _field_stats_result(branch: list) -> Dict[str, int]:
+    """Read the output of a _field_stats_facet branch"""
+    counts = branch[0] if branch else {}
+    return {
+        "unique_values": counts.get("unique", 0),
+        "non_null_documents": counts.get("nonNull", 0)
+    }
+
+
+async def _get_field_stats(collection, fields: List[str]) -> Dict[str, Dict[str, int]]:
+    """Count unique values and non-null documents for several fields in one $facet pass"""
+    # Branch names are positional: field names may contain '.' or start with '$'
+    facets = {f"f{i}": _field_stats_facet(field) for i, field in enumerate(fields)}
+
+    result = next(iter(await fetch_aggregate(collection, [{"$facet": facets}])), {})
+
+    return {field: _field_stats_result(result.get(f"f{i}")) for i, field in enumerate(fields)}
+
+
+@cached(ttl=CACHE_TTL_SECONDS)
 async def get_available_fields() -> list[TextContent]:
     """Get all queryable fields in the database"""
     collection = get_collection()
 
-    # Get a sample document to extract field names
-    sample_doc = collection.find_one()
+    # Get a sample document to extract field names (nested system fields not needed)
+    sample_doc = await collection.find_one({}, projection={"originalData": 0, "tags": 0, "metadata": 0})
 
     if not sample_doc:
         return [TextContent(
             type="text",
-            text=json.dumps({"message": "No documents found in database"}, indent=2)
+            text=_dump({"message": "No documents found in database"})
         )]
 
     # Extract all top-level field names (excluding internal _id and nested objects)
@@ -862,19 +1628,17 @@ async def get_available_fields() -> list[TextContent]:
             else:
                 dynamic_fields.append(field)
 
-    # Get unique values count for each field
+    # Get unique values count for each field, one aggregation per group of fields
     field_stats = {}
-    for field in all_fields:
+    stats_failed = False
+    for start in range(0, len(all_fields), FIELD_STATS_FACET_SIZE):
+        fields = all_fields[start:start + FIELD_STATS_FACET_SIZE]
         try:
-            unique_count = len(collection.distinct(field))
-            non_null_count = collection.count_documents({field: {"$ne": None, "$exists": True}})
-            field_stats[field] = {
-                "unique_values": unique_count,
-                "non_null_documents": non_null_count
-            }
+            field_stats.update(await _get_field_stats(collection, fields))
         except Exception as e:
-            logger.warning(f"Error getting stats for field {field}: {e}")
-            field_stats[field] = {"error": str(e)}
+            logger.warning(f"Error getting stats for fields {fields}: {e}")
+            field_stats.update({field: {"error": str(e)} for field in fields})
+            stats_failed = True
 
     result = {
         "total_fields": len(all_fields),
@@ -888,16 +1652,16 @@ async def get_available_fields() -> list[TextContent]:
         }
     }
 
-    return [TextContent(
-        type="text",
-        text=json.dumps(result, indent=2)
-    )]
+    # Failed field statistics are retried on the next call instead of cached
+    content = [TextContent(type="text", text=_dump(result))]
+    return ErrorResult(content) if stats_failed else content
 
 
 async def advanced_query(
     filters: dict,
     limit: int = 100,
-    fields_to_return: list = None
+    fields_to_return: list = None,
+    count_only: bool = False
 ) -> list[TextContent]:
     """
     Advanced query supporting ANY field combination.
@@ -906,9 +1670,22 @@ async def advanced_query(
         filters: Dictionary of field:value pairs (e.g., {'primaryContact': 'john', 'department': 'IT'})
         limit: Maximum number of results
         fields_to_return: List of fields to include in results (None = all fields)
+        count_only: Return only the number of matching documents
     """
     collection = get_collection()
 
+    if count_only:
+        # No filters: document count from collection metadata (no scan)
+        if filters:
+            hint = index_hint(filters)
+            count = await collection.count_documents(filters, **({"hint": hint} if hint else {}))
+        else:
+            count = await collection.estimated_document_count()
+        return [TextContent(
+            type="text",
+            text=_dump({"filters_applied": filters, "count": count})
+        )]
+
     # Build projection if fields_to_return is specified
     projection = None
     if fields_to_return:
@@ -916,25 +1693,75 @@ async def advanced_query(
         projection['_id'] = 0  # Exclude _id unless explicitly requested
 
     # Execute query
-    if projection:
-        results = list(collection.find(filters, projection).limit(limit))
-    else:
-        results = list(collection.find(filters).limit(limit))
+    cursor = collection.find(filters, projection).limit(limit).batch_size(limit)
+    hint = index_hint(filters, fields_to_return)
+    if hint:
+        cursor = cursor.hint(hint)
+
+    if limit <= RESULT_PAGE_SIZE:
+        # Format response while reading the cursor
+        return [TextContent(
+            type="text",
+            text=await dump_streamed({"filters_applied": filters, "limit": limit}, cursor)
+        )]
 
-    # Format response
-    response = {
+    # Large result: a summary followed by one NDJSON page per RESULT_PAGE_SIZE documents
+    count, pages = await _ndjson_pages(cursor, RESULT_PAGE_SIZE)
+    summary = {
         "filters_applied": filters,
-        "count": len(results),
+        "count": count,
         "limit": limit,
-        "results": results
+        "format": "ndjson",
+        "pages": len(pages)
     }
+    return [TextContent(type="text", text=_dump(summary))] + [
+        TextContent(type="text", text=page) for page in pages
+    ]
 
-    return [TextContent(
-        type="text",
-        text=json.dumps(response, indent=2, default=str)
-    )]
 
+async def _ndjson_pages(cursor, page_size: int) -> tuple[int, list]:
+    """
+    Serialize cursor documents into NDJSON pages of up to page_size documents.
+
+    Each page is encoded as soon as it fills, so only one page of documents
+    is held at a time and no single string grows with the whole result.
 
+    Returns:
+        (number of documents, list of page strings)
+    """
+    pages = []
+    page = []
+    count = 0
+    async for doc in cursor:
+        page.append(orjson.dumps(doc, default=_json_default, option=_COMPACT_OPTIONS))
+        count += 1
+        if len(page) == page_size:
+            pages.append(b"\n".join(page).decode())
+            page = []
+    if page:
+        pages.append(b"\n".join(page).decode())
+    return count, pages
+
+
+# aggregate_by_any_field: aggregation_type -> builder(group_ref, value_ref, value_field)
+# returning the $group stage and the label of its "value" in the results
+_AGG_BUILDERS = {
+    "count": lambda group_ref, value_ref, value_field: (
+        {"$group": {"_id": group_ref, "value": {"$sum": 1}}},
+        "count"
+    ),
+    "sum": lambda group_ref, value_ref, value_field: (
+        {"$group": {"_id": group_ref, "value": {"$sum": value_ref}, "count": {"$sum": 1}}},
+        f"sum_of_{value_field}"
+    ),
+    "avg": lambda group_ref, value_ref, value_field: (
+        {"$group": {"_id": group_ref, "value": {"$avg": value_ref}, "count": {"$sum": 1}}},
+        f"avg_of_{value_field}"
+    ),
+}
+
+
+@cached(ttl=CACHE_TTL_SECONDS, maxsize=ANALYSIS_CACHE_SIZE)
 async def aggregate_by_any_field(
     group_by_field: str,
     aggregation_type: str = "count",
@@ -954,91 +1781,68 @@ async def aggregate_by_any_field(
     """
     collection = get_collection()
 
-    # Build aggregation pipeline
-    pipeline = []
-
-    # Group stage
-    if aggregation_type == "count":
-        pipeline.append({
-            "$group": {
-                "_id": f"${group_by_field}",
-                "value": {"$sum": 1}
-            }
-        })
-        value_label = "count"
-
-    elif aggregation_type == "sum":
-        if not value_field:
-            return [TextContent(
-                type="text",
-                text=json.dumps({"error": "value_field is required for sum aggregation"}, indent=2)
-            )]
-        pipeline.append({
-            "$group": {
-                "_id": f"${group_by_field}",
-                "value": {"$sum": f"${value_field}"},
-                "count": {"$sum": 1}
-            }
-        })
-        value_label = f"sum_of_{value_field}"
+    # Validate field names, then build their "$field" references once
+    for field in (group_by_field, value_field):
+        if field is not None and not is_field_path(field):
+            return error_result({"error": f"Invalid field name: {field!r}"})
+    group_ref = f"${group_by_field}"
+    value_ref = f"${value_field}" if value_field else None
 
-    elif aggregation_type == "avg":
-        if not value_field:
-            return [TextContent(
-                type="text",
-                text=json.dumps({"error": "value_field is required for avg aggregation"}, indent=2)
-            )]
-        pipeline.append({
-            "$group": {
-                "_id": f"${group_by_field}",
-                "value": {"$avg": f"${value_field}"},
-                "count": {"$sum": 1}
-            }
-        })
-        value_label = f"avg_of_{value_field}"
+    # Build aggregation pipeline; only the grouping key (and summed/averaged value) reach the $group
+    pipeline = [group_projection(group_by_field, *([value_field] if value_field else []))]
 
-    # Sort stage
+    # Group stage
+    builder = _AGG_BUILDERS.get(aggregation_type)
+    if builder is None:
+        return error_result({"error": f"Unsupported aggregation_type: {aggregation_type!r} (use count, sum or avg)"})
+    if aggregation_type != "count" and not value_field:
+        return error_result({"error": f"value_field is required for {aggregation_type} aggregation"})
+    group_stage, value_label = builder(group_ref, value_ref, value_field)
+    pipeline.append(group_stage)
+
+    # Sort + limit: keep these two stages adjacent (and the limit a plain int) so
+    # the server coalesces them into a top-K sort holding only `limit` groups
     sort_direction = -1 if sort_order == "desc" else 1
+    limit = int(limit)
     pipeline.append({"$sort": {"value": sort_direction}})
-
-    # Limit stage
     pipeline.append({"$limit": limit})
 
     try:
-        results = list(collection.aggregate(pipeline))
-
-        # Format results
-        formatted_results = []
-        for r in results:
-            result_item = {
-                group_by_field: r["_id"] or "Unknown",
-                value_label: r["value"]
-            }
-            if "count" in r:
-                result_item["count"] = r["count"]
-            formatted_results.append(result_item)
+        # A count only reads the grouping field, which a single-field index covers
+        hint = group_index_hint(group_by_field) if aggregation_type == "count" else None
+        rows = await fetch_aggregate(collection, pipeline, hint, allow_disk_use=False, batch_size=limit)
+
+        # Format results (one cursor batch held all `limit` groups)
+        if aggregation_type == "count":
+            formatted_results = [
+                {group_by_field: r["_id"] or "Unknown", value_label: r["value"]}
+                for r in rows
+            ]
+        else:
+            formatted_results = [
+                {group_by_field: r["_id"] or "Unknown", value_label: r["value"], "count": r["count"]}
+                for r in rows
+            ]
 
         response = {
             "group_by_field": group_by_field,
             "aggregation_type": aggregation_type,
             "value_field": value_field if value_field else "N/A",
             "results": formatted_results,
-            "total_groups": len(results)
+            "total_groups": len(formatted_results)
         }
 
         return [TextContent(
             type="text",
-            text=json.dumps(response, indent=2)
+            text=_dump(response)
         )]
 
     except Exception as e:
         logger.error(f"Error in aggregate_by_any_field: {e}")
-        return [TextContent(
-            type="text",
-            text=json.dumps({"error": str(e)}, indent=2)
-        )]
+        return error_result({"error": str(e)})
 
 
+@cached(ttl=CACHE_TTL_SECONDS, maxsize=ANALYSIS_CACHE_SIZE)
 async def cost_analysis_by_field(
     group_by_field: str,
     filters: dict = None,
@@ -1061,78 +1865,91 @@ async def cost_analysis_by_field(
     if filters:
         pipeline.append({"$match": filters})
 
-    # Add numeric cost field
-    pipeline.append({
-        "$addFields": {
-            "numericCost": {
-                "$cond": {
-                    "if": {"$eq": [{"$type": "$cost"}, "string"]},
-                    "then": {"$toDouble": {"$ifNull": ["$cost", "0"]}},
-                    "else": {"$ifNull": ["$cost", 0]}
-                }
-            }
-        }
-    })
-
-    # Group stage
-    pipeline.append({
-        "$group": {
-            "_id": f"${group_by_field}",
-            "totalCost": {"$sum": "$numericCost"},
-            "avgCost": {"$avg": "$numericCost"},
-            "minCost": {"$min": "$numericCost"},
-            "maxCost": {"$max": "$numericCost"},
-            "count": {"$sum": 1}
-        }
-    })
+    # Only the grouping key and cost reach the $group
+    pipeline.append(group_projection(group_by_field, "cost"))
 
-    # Sort by total cost (descending)
-    pipeline.append({"$sort": {"totalCost": -1}})
+    # Cost coerced to a number in place; missing or unparseable costs count as 0
+    numeric_cost = {"$convert": {"input": "$cost", "to": "double", "onError": 0, "onNull": 0}}
 
-    # Limit
-    pipeline.append({"$limit": limit})
+    # Top groups by total cost, plus the grand total over ALL matching documents
+    # (not just the top `limit` groups), in one pass
+    pipeline.append({"$facet": {
+        "top": [
+            {"$group": {
+                "_id": f"${group_by_field}",
+                "totalCost": {"$sum": numeric_cost},
+                "avgCost": {"$avg": numeric_cost},
+                "minCost": {"$min": numeric_cost},
+                "maxCost": {"$max": numeric_cost},
+                "count": {"$sum": 1}
+            }},
+            {"$sort": {"totalCost": -1}},
+            {"$limit": limit}
+        ],
+        "total": [{"$group": {"_id": None, "grandTotal": {"$sum": numeric_cost}}}]
+    }})
+
+    # Round on the server (cost is already a double after $convert) and work out
+    # each group's share of the grand total there too
+    pipeline.append({"$replaceWith": {"$let": {
+        "vars": {"grand": {"$ifNull": [{"$arrayElemAt": ["$total.grandTotal", 0]}, 0]}},
+        "in": {
+            "grandTotal": {"$round": ["$$grand", 2]},
+            "top": {"$map": {"input": "$top", "as": "r", "in": {
+                "_id": "$$r._id",
+                "totalCost": {"$round": ["$$r.totalCost", 2]},
+                "avgCost": {"$round": ["$$r.avgCost", 2]},
+                "minCost": {"$round": ["$$r.minCost", 2]},
+                "maxCost": {"$round": ["$$r.maxCost", 2]},
+                "count": "$$r.count",
+                "percentageOfTotal": {"$cond": [
+                    {"$gt": ["$$grand", 0]},
+                    {"$round": [{"$multiply": [{"$divide": ["$$r.totalCost", "$$grand"]}, 100]}, 2]},
+                    0
+                ]}
+            }}}
+        }
+    }}})
 
     try:
-        results = list(collection.aggregate(pipeline))
-
-        # Calculate grand total
-        grand_total = sum(r["totalCost"] for r in results)
-
-        # Format results
-        formatted_results = []
-        for r in results:
-            percentage = (r["totalCost"] / grand_total * 100) if grand_total > 0 else 0
-            formatted_results.append({
+        hint = index_hint(filters)
+        # No disk spill: a pipeline outgrowing memory should fail loudly, not slow down
+        result = next(iter(await fetch_aggregate(collection, pipeline, hint, allow_disk_use=False)), {})
+        grand_total = result.get("grandTotal", 0)
+
+        # Format results (values already rounded by the server)
+        formatted_results = [
+            {
                 group_by_field: r["_id"] or "Unknown",
-                "totalCost": round(r["totalCost"], 2),
-                "avgCost": round(r["avgCost"], 2),
-                "minCost": round(r["minCost"], 2),
-                "maxCost": round(r["maxCost"], 2),
+                "totalCost": r["totalCost"],
+                "avgCost": r["avgCost"],
+                "minCost": r["minCost"],
+                "maxCost": r["maxCost"],
                 "resourceCount": r["count"],
-                "percentageOfTotal": round(percentage, 2)
-            })
+                "percentageOfTotal": r["percentageOfTotal"]
+            }
+            for r in result.get("top", [])
+        ]
 
         response = {
             "group_by_field": group_by_field,
             "filters_applied": filters if filters else {},
-            "grand_total_cost": round(grand_total, 2),
+            "grand_total_cost": grand_total,
             "results": formatted_results,
-            "total_groups": len(results)
+            "total_groups": len(formatted_results)
         }
 
         return [TextContent(
             type="text",
-            text=json.dumps(response, indent=2)
+            text=_dump(response)
         )]
 
     except Exception as e:
         logger.error(f"Error in cost_analysis_by_field: {e}")
-        return [TextContent(
-            type="text",
-            text=json.dumps({"error": str(e)}, indent=2)
-        )]
+        return error_result({"error": str(e)})
 
 
+@cached(ttl=CACHE_TTL_SECONDS, maxsize=ANALYSIS_CACHE_SIZE)
 async def multi_dimensional_analysis(
     field1: str,
     field2: str,
@@ -1149,56 +1966,51 @@ async def multi_dimensional_analysis(
         limit: Maximum number of items per dimension
     """
     collection = get_collection()
-
-    # Build aggregation pipeline
-    pipeline = []
-
-    # Match stage (if filters provided)
-    if filters:
-        pipeline.append({"$match": filters})
-
-    # Group by both fields
-    pipeline.append({
-        "$group": {
-            "_id": {
-                "field1": f"${field1}",
-                "field2": f"${field2}"
-            },
-            "count": {"$sum": 1}
-        }
-    })
+    match_stages = [{"$match": filters}] if filters else []
 
     try:
-        results = list(collection.aggregate(pipeline))
-
-        # Convert to matrix format
-        matrix = {}
-        field1_values = set()
-        field2_values = set()
-
-        for r in results:
-            f1_val = r["_id"]["field1"] or "Unknown"
-            f2_val = r["_id"]["field2"] or "Unknown"
-            count = r["count"]
-
-            field1_values.add(f1_val)
-            field2_values.add(f2_val)
-
-            if f1_val not in matrix:
-                matrix[f1_val] = {}
-            matrix[f1_val][f2_val] = count
-
-        # Limit dimensions if needed
-        field1_values = sorted(list(field1_values))[:limit]
-        field2_values = sorted(list(field2_values))[:limit]
+        # First `limit` labels of each dimension (sorted, null/empty as "Unknown"),
+        # so only their combinations are grouped and returned
+        field1_values, field2_values = await run_concurrently(
+            fetch_aggregate(collection, match_stages + dimension_values_pipeline(field1, limit), batch_size=limit),
+            fetch_aggregate(collection, match_stages + dimension_values_pipeline(field2, limit), batch_size=limit)
+        )
+        field1_values = [r["_id"] for r in field1_values]
+        field2_values = [r["_id"] for r in field2_values]
+
+        # Build aggregation pipeline
+        pipeline = match_stages + [
+            {"$match": {field1: {"$in": label_match_values(field1_values)},
+                        field2: {"$in": label_match_values(field2_values)}}},
+            # Only the two dimensions reach the $group
+            group_projection(field1, field2),
+            # Group by both fields
+            {"$group": {
+                "_id": {
+                    "field1": f"${field1}",
+                    "field2": f"${field2}"
+                },
+                "count": {"$sum": 1}
+            }}
+        ]
+
+        # Fill a count matrix indexed by each value's position
+        index1 = {value: i for i, value in enumerate(field1_values)}
+        index2 = {value: j for j, value in enumerate(field2_values)}
+        matrix = np.zeros((len(field1_values), len(field2_values)), dtype=np.int64)
+        total_combinations = 0
+        for r in await fetch_aggregate(collection, pipeline, allow_disk_use=False):
+            total_combinations += 1
+            i = index1.get(r["_id"].get("field1") or "Unknown")
+            j = index2.get(r["_id"].get("field2") or "Unknown")
+            if i is not None and j is not None:
+                matrix[i, j] = r["count"]
 
         # Build formatted matrix
-        formatted_matrix = []
-        for f1_val in field1_values:
-            row = {field1: f1_val}
-            for f2_val in field2_values:
-                row[f2_val] = matrix.get(f1_val, {}).get(f2_val, 0)
-            formatted_matrix.append(row)
+        formatted_matrix = [
+            {field1: f1_val, **dict(zip(field2_values, row))}
+            for f1_val, row in zip(field1_values, matrix.tolist())
+        ]
 
         response = {
             "field1": field1,
@@ -1207,20 +2019,17 @@ async def multi_dimensional_analysis(
             "field2_values": field2_values,
             "filters_applied": filters if filters else {},
             "matrix": formatted_matrix,
-            "total_combinations": len(results)
+            "total_combinations": total_combinations
         }
 
         return [TextContent(
             type="text",
-            text=json.dumps(response, indent=2)
+            text=_dump(response)
         )]
 
     except Exception as e:
         logger.error(f"Error in multi_dimensional_analysis: {e}")
-        return [TextContent(
-            type="text",
-            text=json.dumps({"error": str(e)}, indent=2)
-        )]
+        return error_result({"error": str(e)})
 
 
 async def main():
@@ -1228,14 +2037,45 @@ async def main():
     from mcp.server.stdio import stdio_server
 
     logger.info("Starting MongoDB MCP Server for Azure Analytics")
+    _long_lived_loops.add(asyncio.get_running_loop())
 
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
+    await prepare_collection()
+
+    ensure_chart_renderer()
+
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options()
+            )
+    finally:
+        await close_loop_client()
+
+
+async def run_cost_migration() -> int:
+    """
+    Convert string costs to numbers and exit (`--migrate-costs`).
+
+    Runs the migration even if it is already recorded, e.g. after restoring
+    data exported by an older version.
+
+    Returns:
+        Process exit code
+    """
+    try:
+        modified = await ensure_cost_migration(force=True)
+        logger.info(f"Cost migration finished, {modified} documents updated")
+        return 0
+    except Exception as e:
+        logger.error(f"Cost migration failed: {e}")
+        return 1
+    finally:
+        await close_loop_client()
 
 
 if __name__ == "__main__":
+    if "--migrate-costs" in sys.argv[1:]:
+        sys.exit(asyncio.run(run_cost_migration()))
     asyncio.run(main())
@@ -6,14 +6,15 @@ This module provides both CLI and programmatic interfaces for processing Excel f
 import sys
 import os
 import logging
+from collections import deque
 from typing import Optional
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 import config
-from src.processor.excel_reader import read_excel_in_chunks
+from src.processor.excel_reader import read_excel_in_chunks, get_total_rows, prefetch_chunks
 from src.processor.tag_parser import process_dataframe
-from src.processor.excel_writer import write_chunks_to_excel
+from src.processor.excel_writer import write_chunks
 from src.utils.validators import validate_excel_file, validate_tag_column
 
 # Configure logging
@@ -24,6 +25,12 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _process_chunk(item):
+    """Process one (chunk, total_rows) item; top-level so it can be sent to pool workers."""
+    chunk, total_rows = item
+    return process_dataframe(chunk), total_rows
+
+
 def process_excel_file(
     input_path: str,
     output_path: str,
@@ -34,7 +41,8 @@ def process_excel_file(
 
     Args:
         input_path: Path to input Excel file
-        output_path: Path where processed file will be saved
+        output_path: Path where processed file will be saved (.csv and .parquet
+            write that format, anything else an Excel file)
         progress_callback: Optional callback function(processed_rows, total_rows)
 
     Returns:
@@ -54,24 +62,46 @@ def process_excel_file(
         return False
 
     try:
-        processed_chunks = []
         total_processed = 0
 
-        # Process file in chunks
-        for chunk, total_rows in read_excel_in_chunks(input_path):
-            # Process the chunk
-            processed_chunk = process_dataframe(chunk)
-            processed_chunks.append(processed_chunk)
+        def record(processed_chunk, total_rows):
+            nonlocal total_processed
 
             # Update progress
-            total_processed += len(chunk)
+            total_processed += len(processed_chunk)
 
             if progress_callback:
                 progress_callback(total_processed, total_rows)
 
-        # Write results
-        logger.info(f"Writing {total_processed} rows to {output_path}")
-        write_chunks_to_excel(processed_chunks, output_path)
+            return processed_chunk
+
+        def processed_chunks():
+            # Process file in chunks, handing each one to the writer as it is done
+            chunks = read_excel_in_chunks(input_path)
+            if config.ENABLE_PARALLEL_PROCESSING:
+                workers = config.get_worker_count(get_total_rows(input_path))
+                logger.info(f"Processing chunks in parallel with {workers} workers")
+                # At most 2 chunks per worker are in flight, so a slow writer
+                # does not let finished chunks pile up; results are yielded
+                # in file order
+                pending = deque()
+                with config.make_pool(workers) as pool:
+                    for chunk in chunks:
+                        pending.append(pool.apply_async(_process_chunk, (chunk,)))
+                        if len(pending) >= 2 * workers:
+                            yield record(*pending.popleft().get())
+                    while pending:
+                        yield record(*pending.popleft().get())
+            else:
+                # A reader thread overlaps parsing the next chunk with
+                # processing this one
+                for item in prefetch_chunks(chunks):
+                    yield record(*_process_chunk(item))
+
+        # Write results (chunks are streamed, not collected in memory)
+        logger.info(f"Writing processed rows to {output_path}")
+        write_chunks(processed_chunks(), output_path)
+        logger.info(f"Wrote {total_processed} rows to {output_path}")
 
         logger.info("Processing completed successfully")
         return True
@@ -97,10 +127,14 @@ def main():
         print("Example:")
         print("  python src/app.py data/input.xlsx data/output.xlsx")
         print()
+        print("An output file ending in .csv or .parquet is written in that format (faster than .xlsx).")
+        print()
         print("For web interface, run:")
         print("  streamlit run src/ui/streamlit_app.py")
         sys.exit(1)
 
+    config.ensure_dirs()
+
     input_file = sys.argv[1]
     output_file = sys.argv[2]
 
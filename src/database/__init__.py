@@ -2,12 +2,13 @@
 Database module for MongoDB operations
 """
 from .mongodb_client import get_mongodb_client, get_database, get_collection
-from .mongodb_operations import insert_dataframe_to_mongodb, create_indexes
+from .mongodb_operations import insert_dataframe_to_mongodb, insert_records_to_mongodb, create_indexes
 
 __all__ = [
     'get_mongodb_client',
     'get_database',
     'get_collection',
     'insert_dataframe_to_mongodb',
+    'insert_records_to_mongodb',
     'create_indexes'
 ]
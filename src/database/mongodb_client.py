@@ -14,13 +14,17 @@ import config
 
 logger = logging.getLogger(__name__)
 
-# Global MongoDB client instance
-_mongodb_client = None
+# MongoDB client instances, one per process (keyed by PID)
+_mongodb_clients = {}
 
 
 def get_mongodb_client() -> MongoClient:
     """
-    Get MongoDB client instance (singleton pattern).
+    Get MongoDB client instance (one singleton per process).
+
+    MongoClient is not fork-safe, so a worker process forked from a parent
+    that already connected gets its own client instead of reusing the
+    parent's sockets. Within a process the client is reused across chunks.
 
     Returns:
         MongoClient instance
@@ -28,25 +32,28 @@ def get_mongodb_client() -> MongoClient:
     Raises:
         ConnectionError: If unable to connect to MongoDB
     """
-    global _mongodb_client
+    pid = os.getpid()
+    client = _mongodb_clients.get(pid)
 
-    if _mongodb_client is None:
+    if client is None:
         try:
             logger.info(f"Connecting to MongoDB at {config.MONGODB_URI}")
-            _mongodb_client = MongoClient(
+            client = MongoClient(
                 config.MONGODB_URI,
                 serverSelectionTimeoutMS=5000  # 5 second timeout
             )
 
             # Test connection
-            _mongodb_client.admin.command('ping')
+            client.admin.command('ping')
             logger.info("Successfully connected to MongoDB")
 
         except Exception as e:
             logger.error(f"Failed to connect to MongoDB: {e}")
             raise ConnectionError(f"Could not connect to MongoDB at {config.MONGODB_URI}. Error: {e}")
 
-    return _mongodb_client
+        _mongodb_clients[pid] = client
+
+    return client
 
 
 def get_database(db_name: str = None) -> Database:
@@ -105,11 +112,10 @@ def test_connection() -> bool:
 
 def close_connection():
     """
-    Close MongoDB connection.
+    Close this process's MongoDB connection.
     """
-    global _mongodb_client
+    client = _mongodb_clients.pop(os.getpid(), None)
 
-    if _mongodb_client is not None:
-        _mongodb_client.close()
-        _mongodb_client = None
+    if client is not None:
+        client.close()
         logger.info("MongoDB connection closed")
@@ -1,10 +1,15 @@
 """
 MongoDB operations module for data insertion and querying with progress tracking
 """
+import bson
 import pandas as pd
+from bson import ObjectId
+from bson.raw_bson import RawBSONDocument
+from pymongo import InsertOne, MongoClient, WriteConcern
 from pymongo.collection import Collection
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, List, Any, Callable, Optional
+from typing import Dict, Iterator, List, Any, Callable, Optional, Union
 import logging
 import sys
 import os
@@ -14,7 +19,18 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 import config
 from src.database.mongodb_client import get_collection
 
-logger = logging.getLogger(__name__)
+logger = config.get_logger(__name__)
+
+# Possible names of the cost column, in order of preference
+COST_COLUMN_NAMES = ('Cost', 'CostUSD', 'cost', 'COST', 'PreTaxCost', 'CostInBillingCurrency')
+
+# Known columns that should not be treated as dynamically parsed fields
+# These are columns from the original Excel file or system columns
+SYSTEM_COLUMNS = frozenset({
+    'Tags',  # Original tags column
+    'Date',  # Added by our processor
+    config.TAG_COLUMN if hasattr(config, 'TAG_COLUMN') else 'Tags',
+}) | frozenset(COST_COLUMN_NAMES)  # Cost columns might be in the original Excel
 
 
 def to_camel_case(column_name: str) -> str:
@@ -42,7 +58,79 @@ def to_camel_case(column_name: str) -> str:
     return camel
 
 
-def prepare_document(row: pd.Series, source_file: str = None) -> Dict[str, Any]:
+def to_numeric_cost(value: Any) -> Any:
+    """
+    Convert a cost read as text (e.g. '12.50') to a float.
+
+    Costs are stored as numbers so aggregations can sum them directly;
+    values that are not numeric strings are returned unchanged.
+
+    Args:
+        value: Raw cost value from the Excel row
+
+    Returns:
+        Float for numeric strings, otherwise the original value
+    """
+    if isinstance(value, str):
+        try:
+            return float(value.strip())
+        except ValueError:
+            logger.debug("Cost value '%s' is not numeric, storing as text", value)
+    return value
+
+
+def _isoformat_cell(value: Any) -> Any:
+    """Return value.isoformat() for datetime cells, other values unchanged."""
+    if isinstance(value, datetime):  # Includes pd.Timestamp
+        return value.isoformat()
+    return value
+
+
+def clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Make DataFrame values JSON/BSON friendly column by column.
+
+    Datetime cells become isoformat() strings, both in datetime columns and
+    in object columns mixing dates with other values, and NaN/NaT become
+    None, so prepare_document does not have to inspect every cell.
+
+    Args:
+        df: DataFrame to clean
+
+    Returns:
+        New DataFrame of object dtype
+    """
+    missing = df.isna()
+    columns = df.select_dtypes(include=['datetime', 'datetimetz', 'object']).columns
+    df = df.astype(object)
+    for column in columns:
+        df[column] = df[column].map(_isoformat_cell)
+
+    return df.where(~missing, None)
+
+
+def find_cost_columns(columns) -> List[str]:
+    """
+    Find which of COST_COLUMN_NAMES a sheet has, in order of preference.
+
+    Computed once per file so prepare_document only checks columns that exist.
+
+    Args:
+        columns: Column names of the sheet
+
+    Returns:
+        Cost column names present in columns
+    """
+    present = set(columns)
+    return [name for name in COST_COLUMN_NAMES if name in present]
+
+
+def prepare_document(
+    record: Dict[str, Any],
+    source_file: str = None,
+    cost_columns: List[str] = None,
+    imported_at: datetime = None
+) -> Dict[str, Any]:
     """
     Prepare a single document for MongoDB insertion with dynamic field extraction.
 
@@ -51,7 +139,7 @@ def prepare_document(row: pd.Series, source_file: str = None) -> Dict[str, Any]:
     - Standard fields: applicationName, environment, owner, cost, date
     - ALL dynamically parsed tag fields added at top level (e.g., primaryContact, usage, etc.)
     - Metadata: importDate, sourceFile, importTimestamp
-    - Clean data: NaN converted to None, timestamps converted to ISO format
+    - Clean data: NaN as None, timestamps as ISO strings (see clean_dataframe)
 
     Dynamic Fields:
     - Any column NOT in the original Excel (extracted from tags) is added as a top-level field
@@ -60,53 +148,38 @@ def prepare_document(row: pd.Series, source_file: str = None) -> Dict[str, Any]:
     - All dynamic fields are also stored in 'tags.parsed' for reference
 
     Args:
-        row: DataFrame row as Series
+        record: Row of a DataFrame cleaned by clean_dataframe, as a plain dict;
+                kept as the document's originalData
         source_file: Name of the source Excel file
+        cost_columns: Cost columns of the sheet from find_cost_columns
+                      (default: looked up in this record)
+        imported_at: Import time shared by every document of one insert
+                     (default: now)
 
     Returns:
         Dictionary ready for MongoDB insertion with all dynamic fields
     """
-    # Convert row to dictionary and replace NaN with None
-    doc = row.to_dict()
+    doc = record
+    if imported_at is None:
+        imported_at = datetime.utcnow()
+
+    # Get cost from the first cost column with a value
+    if cost_columns is None:
+        cost_columns = find_cost_columns(doc)
 
-    # Get cost from the Cost column BEFORE replacing NaN (to preserve raw value)
-    # Try different possible column names for cost
     cost_value = None
-    cost_column_found = None
-
-    for cost_key in ['Cost', 'CostUSD', 'cost', 'COST', 'PreTaxCost', 'CostInBillingCurrency']:
-        if cost_key in doc:
-            raw_cost = doc.get(cost_key)
-            # Check if value exists and is not NaN
-            if raw_cost is not None and not pd.isna(raw_cost):
-                cost_value = raw_cost
-                cost_column_found = cost_key
-                logger.info(f"Found cost value from column '{cost_key}': {cost_value}")
-                break
-            elif cost_key in doc:
-                logger.debug(f"Column '{cost_key}' exists but value is NaN or None")
+    for cost_key in cost_columns:
+        raw_cost = doc.get(cost_key)
+        # Check if value exists (NaN was converted to None)
+        if raw_cost is not None:
+            cost_value = to_numeric_cost(raw_cost)
+            logger.debug("Found cost value from column '%s': %s", cost_key, cost_value)
+            break
+        logger.debug("Column '%s' exists but value is NaN or None", cost_key)
 
     # If cost is still None, log available columns for debugging
     if cost_value is None:
-        logger.warning(f"Cost value is None. Available columns: {list(doc.keys())[:20]}")  # Show first 20 columns
-
-    # Replace pandas NaN/NaT with None for proper JSON serialization
-    for key, value in doc.items():
-        if pd.isna(value):
-            doc[key] = None
-        elif isinstance(value, (pd.Timestamp, datetime)):
-            doc[key] = value.isoformat()
-
-    # Define known columns that should not be treated as dynamically parsed fields
-    # These are columns from the original Excel file or system columns
-    SYSTEM_COLUMNS = {
-        'Tags',  # Original tags column
-        'Date',  # Added by our processor
-        config.TAG_COLUMN if hasattr(config, 'TAG_COLUMN') else 'Tags',
-    }
-
-    # Also try to identify cost columns (they might be in original Excel)
-    COST_COLUMN_NAMES = ['Cost', 'CostUSD', 'cost', 'COST', 'PreTaxCost', 'CostInBillingCurrency']
+        logger.warning("Cost value is None. Available columns: %s", list(doc)[:20])  # Show first 20 columns
 
     # Extract all dynamically parsed fields (columns that are NOT system columns)
     # These are the fields extracted from tags by the dynamic parser
@@ -114,8 +187,8 @@ def prepare_document(row: pd.Series, source_file: str = None) -> Dict[str, Any]:
     parsed_fields = {}
 
     for column, value in doc.items():
-        # Skip if it's a system column
-        if column in SYSTEM_COLUMNS or column in COST_COLUMN_NAMES:
+        # Skip if it's a system or cost column
+        if column in SYSTEM_COLUMNS:
             continue
 
         # Skip if value is None (NaN was converted to None)
@@ -129,7 +202,7 @@ def prepare_document(row: pd.Series, source_file: str = None) -> Dict[str, Any]:
 
     # Log the dynamic fields being added
     if dynamic_fields:
-        logger.debug(f"Adding {len(dynamic_fields)} dynamic fields: {list(dynamic_fields.keys())}")
+        logger.debug("Adding %d dynamic fields: %s", len(dynamic_fields), list(dynamic_fields))
 
     # Restructure for better querying and dashboard creation
     structured_doc = {
@@ -151,9 +224,9 @@ def prepare_document(row: pd.Series, source_file: str = None) -> Dict[str, Any]:
 
         # Metadata for tracking
         'metadata': {
-            'importDate': datetime.utcnow(),
+            'importDate': imported_at,
             'sourceFile': source_file,
-            'importTimestamp': datetime.utcnow().isoformat(),
+            'importTimestamp': imported_at.isoformat(),
             'dataDate': doc.get('Date')  # Also store in metadata for easy access
         }
     }
@@ -165,16 +238,163 @@ def prepare_document(row: pd.Series, source_file: str = None) -> Dict[str, Any]:
     return structured_doc
 
 
+def encode_document(doc: Dict[str, Any]) -> RawBSONDocument:
+    """
+    Encode a prepared document to BSON once, ahead of insertion.
+
+    An _id is assigned here because the driver does not add one to raw
+    documents.
+
+    Args:
+        doc: Document returned by prepare_document
+
+    Returns:
+        RawBSONDocument wrapping the encoded bytes
+    """
+    doc.setdefault('_id', ObjectId())
+    return RawBSONDocument(bson.encode(doc), codec_options=config.BSON_CODEC_OPTIONS)
+
+
+def supports_client_bulk_write(client: MongoClient) -> bool:
+    """
+    Check whether the client-level bulkWrite command can be used.
+
+    Requires PyMongo 4.9+ (MongoClient.bulk_write) and MongoDB 8.0+.
+
+    Args:
+        client: MongoDB client
+
+    Returns:
+        True if client.bulk_write is available for this driver and server
+    """
+    if not hasattr(client, 'bulk_write'):
+        return False
+
+    try:
+        return client.server_info().get('versionArray', [0])[0] >= 8
+    except Exception as e:
+        logger.debug(f"Could not determine server version: {e}")
+        return False
+
+
+def iter_batches(
+    documents: List[Union[RawBSONDocument, Dict[str, Any]]],
+    max_docs: int,
+    max_bytes: int = None
+) -> Iterator[List[Union[RawBSONDocument, Dict[str, Any]]]]:
+    """
+    Split documents into insert batches bounded by count and encoded size.
+
+    A batch is closed when adding the next document would exceed max_bytes,
+    so each batch goes out as a single write command instead of being split
+    by the driver.
+
+    Args:
+        documents: Documents to insert (raw BSON documents are measured without re-encoding)
+        max_docs: Maximum documents per batch
+        max_bytes: Maximum BSON bytes per batch (default from config)
+
+    Yields:
+        Lists of documents
+    """
+    if max_bytes is None:
+        max_bytes = config.MONGODB_WRITE_BATCH_BYTES
+
+    batch = []
+    batch_bytes = 0
+    for doc in documents:
+        doc_bytes = len(doc.raw) if isinstance(doc, RawBSONDocument) else len(bson.encode(doc))
+        if batch and (len(batch) >= max_docs or batch_bytes + doc_bytes > max_bytes):
+            yield batch
+            batch = []
+            batch_bytes = 0
+        batch.append(doc)
+        batch_bytes += doc_bytes
+
+    if batch:
+        yield batch
+
+
+def insert_batch(collection: Collection, batch: List[Dict[str, Any]], use_client_bulk: bool = False) -> int:
+    """
+    Insert one batch of documents in a single round-trip.
+
+    Args:
+        collection: Target MongoDB collection
+        batch: Documents to insert
+        use_client_bulk: Use the client-level bulkWrite command (MongoDB 8.0+)
+                         instead of collection.insert_many
+
+    Returns:
+        Number of documents inserted (sent, for an unacknowledged collection)
+    """
+    if not collection.write_concern.acknowledged:
+        # No reply comes back, so there are no inserted ids or counts to read
+        collection.bulk_write([InsertOne(doc) for doc in batch], ordered=False)
+        return len(batch)
+
+    if use_client_bulk:
+        namespace = collection.full_name
+        result = collection.database.client.bulk_write(
+            [InsertOne(doc, namespace=namespace) for doc in batch],
+            ordered=config.MONGODB_BULK_ORDERED
+        )
+        return result.inserted_count
+
+    result = collection.insert_many(batch, ordered=config.MONGODB_BULK_ORDERED)
+    return len(result.inserted_ids)
+
+
 def insert_dataframe_to_mongodb(
     df: pd.DataFrame,
     source_file: str = None,
     collection_name: str = None,
-    batch_size: int = 1000,
-    progress_callback: Optional[Callable[[int, int, str], None]] = None
+    batch_size: int = None,
+    progress_callback: Optional[Callable[[int, int, str], None]] = None,
+    bulk_load: bool = False,
+    acknowledged: bool = True
 ) -> Dict[str, Any]:
     """
     Insert DataFrame into MongoDB with proper schema design and progress tracking.
 
+    The DataFrame is cleaned with clean_dataframe and inserted as plain dict
+    records; see insert_records_to_mongodb for the arguments and result.
+
+    Args:
+        df: DataFrame to insert
+
+    Returns:
+        Dictionary with insertion statistics
+    """
+    # Plain dicts avoid building a pandas Series for every row
+    records = clean_dataframe(df).to_dict(orient='records')
+    return insert_records_to_mongodb(
+        records,
+        source_file=source_file,
+        collection_name=collection_name,
+        batch_size=batch_size,
+        progress_callback=progress_callback,
+        bulk_load=bulk_load,
+        acknowledged=acknowledged
+    )
+
+
+def insert_records_to_mongodb(
+    records: List[Dict[str, Any]],
+    source_file: str = None,
+    collection_name: str = None,
+    batch_size: int = None,
+    progress_callback: Optional[Callable[[int, int, str], None]] = None,
+    bulk_load: bool = False,
+    acknowledged: bool = True
+) -> Dict[str, Any]:
+    """
+    Insert rows given as plain dicts into MongoDB with progress tracking.
+
+    Records must already be clean: None for empty cells and ISO strings for
+    timestamps, as produced by clean_dataframe or
+    excel_reader.read_excel_as_dicts.
+
     The schema is optimized for:
     - Fast querying by applicationName, environment, owner
     - Dashboard creation with aggregations
@@ -182,70 +402,103 @@ def insert_dataframe_to_mongodb(
     - Preserving all original Excel data
 
     Args:
-        df: DataFrame to insert
+        records: Rows to insert, one dict per row keyed by column name
         source_file: Name of the source Excel file
         collection_name: MongoDB collection name (default from config)
-        batch_size: Number of documents to insert per batch
+        batch_size: Maximum number of documents to insert per batch (default from config);
+                    batches are also capped at config.MONGODB_WRITE_BATCH_BYTES
         progress_callback: Optional callback function(current, total, message) to report progress
+        bulk_load: Drop the indexes before inserting and build them once afterwards,
+                   instead of updating them per document. Only for loads nothing
+                   else queries or writes meanwhile (e.g. a first load); the
+                   indexes are rebuilt even if the insertion fails
+        acknowledged: Wait for the server to acknowledge each batch. With False,
+                      batches are sent with write concern w=0: faster, but write
+                      errors go unreported and 'inserted' counts documents sent
 
     Returns:
         Dictionary with insertion statistics
     """
     collection = get_collection(collection_name)
+    raw_bson = config.MONGODB_RAW_BSON
+    ingest_collection = (
+        collection.with_options(codec_options=config.BSON_CODEC_OPTIONS) if raw_bson else collection
+    )
+    if not acknowledged:
+        ingest_collection = ingest_collection.with_options(write_concern=WriteConcern(w=0))
 
-    logger.info(f"Preparing to insert {len(df)} documents into MongoDB")
+    if batch_size is None:
+        batch_size = config.MONGODB_BULK_BATCH
 
-    total_docs = len(df)
-    total_batches = (total_docs + batch_size - 1) // batch_size  # Ceiling division
+    total_docs = len(records)
+    logger.info(f"Preparing to insert {total_docs} documents into MongoDB")
 
     # Step 1: Prepare all documents
     if progress_callback:
         progress_callback(0, total_docs, "Preparing documents for MongoDB...")
 
+    # All rows of a sheet share its columns, so the cost column lookup is done once
+    cost_columns = find_cost_columns(records[0]) if records else []
+    imported_at = datetime.utcnow()
     documents = []
-    for idx, row in df.iterrows():
-        doc = prepare_document(row, source_file)
-        documents.append(doc)
+    for count, record in enumerate(records, start=1):
+        doc = prepare_document(record, source_file, cost_columns, imported_at)
+        documents.append(encode_document(doc) if raw_bson else doc)
 
         # Report preparation progress every 1000 documents
-        if progress_callback and (idx + 1) % 1000 == 0:
-            progress_callback(idx + 1, total_docs, f"Prepared {idx + 1:,}/{total_docs:,} documents...")
+        if progress_callback and count % 1000 == 0:
+            progress_callback(count, total_docs, f"Prepared {count:,}/{total_docs:,} documents...")
 
     if progress_callback:
         progress_callback(total_docs, total_docs, f"All {total_docs:,} documents prepared!")
 
-    # Step 2: Insert in batches for better performance
+    # Step 2: Insert in batches for better performance. Batches are unordered,
+    # so several are sent at once to overlap their network round-trips.
+    batches = list(iter_batches(documents, batch_size))
+    total_batches = len(batches)
     total_inserted = 0
     failed_inserts = 0
-    current_batch_num = 0
 
+    use_client_bulk = (
+        acknowledged and config.MONGODB_USE_CLIENT_BULK and supports_client_bulk_write(collection.database.client)
+    )
+    if use_client_bulk:
+        logger.info("Using client-level bulkWrite for insertion")
+
+    indexes_dropped = False
+    indexes_built = False
     try:
-        for i in range(0, len(documents), batch_size):
-            batch = documents[i:i + batch_size]
-            current_batch_num += 1
-
-            try:
-                if progress_callback:
-                    progress_callback(
-                        total_inserted,
-                        total_docs,
-                        f"Inserting batch {current_batch_num}/{total_batches} ({len(batch)} documents)..."
-                    )
-
-                result = collection.insert_many(batch, ordered=False)
-                total_inserted += len(result.inserted_ids)
-                logger.info(f"Inserted batch {current_batch_num}/{total_batches}: {len(result.inserted_ids)} documents")
-
-                if progress_callback:
-                    progress_callback(
-                        total_inserted,
-                        total_docs,
-                        f"Inserted {total_inserted:,}/{total_docs:,} documents..."
-                    )
-
-            except Exception as e:
-                failed_inserts += len(batch)
-                logger.error(f"Error inserting batch {current_batch_num}: {e}")
+        if bulk_load:
+            indexes_dropped = True  # Set first, so a partial drop is rebuilt too
+            drop_secondary_indexes(collection)
+
+        if progress_callback:
+            progress_callback(0, total_docs, f"Inserting {total_batches} batches...")
+
+        with ThreadPoolExecutor(max_workers=config.MONGODB_INSERT_WORKERS) as pool:
+            futures = {
+                pool.submit(insert_batch, ingest_collection, batch, use_client_bulk): (batch_num, len(batch))
+                for batch_num, batch in enumerate(batches, start=1)
+            }
+
+            # Progress is reported from this thread as batches complete
+            for future in as_completed(futures):
+                batch_num, batch_len = futures[future]
+                try:
+                    inserted = future.result()
+                    total_inserted += inserted
+                    logger.info(f"Inserted batch {batch_num}/{total_batches}: {inserted} documents")
+
+                    if progress_callback:
+                        progress_callback(
+                            total_inserted,
+                            total_docs,
+                            f"Inserted {total_inserted:,}/{total_docs:,} documents..."
+                        )
+
+                except Exception as e:
+                    failed_inserts += batch_len
+                    logger.error(f"Error inserting batch {batch_num}: {e}")
 
         logger.info(f"Successfully inserted {total_inserted} documents")
 
@@ -254,15 +507,17 @@ def insert_dataframe_to_mongodb(
             progress_callback(total_docs, total_docs, "Creating database indexes...")
 
         create_indexes(collection)
+        indexes_built = True
 
         if progress_callback:
             progress_callback(total_docs, total_docs, "✅ MongoDB insertion complete!")
 
         return {
             'success': True,
-            'total_documents': len(df),
+            'total_documents': total_docs,
             'inserted': total_inserted,
             'failed': failed_inserts,
+            'acknowledged': acknowledged,
             'collection': collection.name,
             'database': collection.database.name
         }
@@ -272,22 +527,32 @@ def insert_dataframe_to_mongodb(
         return {
             'success': False,
             'error': str(e),
-            'total_documents': len(df),
+            'total_documents': total_docs,
             'inserted': total_inserted,
             'failed': failed_inserts
         }
 
+    finally:
+        # Never leave a bulk-loaded collection without its indexes
+        if indexes_dropped and not indexes_built:
+            logger.warning("Insertion stopped after indexes were dropped, rebuilding them")
+            create_indexes(collection)
+
 
 def create_indexes(collection: Collection = None) -> None:
     """
     Create indexes on MongoDB collection for better query performance.
 
-    Indexes are created on:
-    - applicationName (for filtering by app)
-    - environment (for filtering by env)
-    - owner (for filtering by owner)
-    - metadata.importDate (for time-based queries)
-    - Compound index on applicationName + environment
+    Index definitions live in config.MONGODB_INDEXES; those not already on the
+    collection are submitted in a single createIndexes command. They include:
+    - Partial compound index on applicationName + environment + owner (also
+      serves applicationName-only and applicationName + environment queries;
+      rows without an application name are not indexed)
+    - applicationName, owner, cost, metadata.importDate and tag fields
+    - Compound indexes for environment/date query patterns (these also
+      serve queries on their leading field alone)
+
+    Superseded indexes (config.MONGODB_SUPERSEDED_INDEXES) are dropped first.
 
     Args:
         collection: MongoDB collection (default from config)
@@ -298,30 +563,49 @@ def create_indexes(collection: Collection = None) -> None:
     logger.info("Creating indexes for better query performance")
 
     try:
-        # Single field indexes
-        collection.create_index('applicationName')
-        collection.create_index('environment')
-        collection.create_index('owner')
-        collection.create_index('cost')
-        collection.create_index('date')  # Index for date field (YYYY-MM format)
-        collection.create_index('metadata.importDate')
-
-        # Compound indexes for common query patterns
-        collection.create_index([('applicationName', 1), ('environment', 1)])
-        collection.create_index([('environment', 1), ('owner', 1)])
-        collection.create_index([('environment', 1), ('cost', 1)])
-        collection.create_index([('date', 1), ('environment', 1)])  # Date + environment queries
-        collection.create_index([('date', 1), ('applicationName', 1)])  # Date + app queries
-
-        # Text index for searching
-        collection.create_index([('tags.raw', 'text')])
-
-        logger.info("Successfully created all indexes")
+        existing = collection.index_information()
+        for name in config.MONGODB_SUPERSEDED_INDEXES:
+            if name in existing:
+                logger.info(f"Dropping superseded index '{name}'")
+                collection.drop_index(name)
+
+        # Only send the indexes that are missing; after the first load there
+        # are usually none and no createIndexes command is issued
+        missing = [index for index in config.MONGODB_INDEXES if index.document['name'] not in existing]
+        if not missing:
+            logger.info("All indexes already exist")
+            return
+
+        collection.create_indexes(missing)
+
+        logger.info(f"Successfully created {len(missing)} indexes")
 
     except Exception as e:
         logger.warning(f"Error creating indexes (may already exist): {e}")
 
 
+def drop_secondary_indexes(collection: Collection = None) -> None:
+    """
+    Drop the indexes that create_indexes builds, ahead of a bulk load.
+
+    Only indexes named in config.MONGODB_INDEXES (or superseded by them) are
+    dropped, so _id and any indexes created outside this application remain.
+
+    Args:
+        collection: MongoDB collection (default from config)
+    """
+    if collection is None:
+        collection = get_collection()
+
+    managed = {index.document['name'] for index in config.MONGODB_INDEXES}
+    managed.update(config.MONGODB_SUPERSEDED_INDEXES)
+
+    for name in collection.index_information():
+        if name in managed:
+            logger.info(f"Dropping index '{name}' for bulk load")
+            collection.drop_index(name)
+
+
 def get_statistics(collection_name: str = None) -> Dict[str, Any]:
     """
     Get statistics about the MongoDB collection for dashboards.
@@ -335,14 +619,18 @@ def get_statistics(collection_name: str = None) -> Dict[str, Any]:
     collection = get_collection(collection_name)
 
     try:
+        # Document count from collection metadata (no scan); each distinct list fetched once
+        applications = collection.distinct('applicationName')
+        environments = collection.distinct('environment')
+        owners = collection.distinct('owner')
         stats = {
-            'total_documents': collection.count_documents({}),
-            'unique_applications': len(collection.distinct('applicationName')),
-            'unique_environments': len(collection.distinct('environment')),
-            'unique_owners': len(collection.distinct('owner')),
-            'applications': collection.distinct('applicationName'),
-            'environments': collection.distinct('environment'),
-            'owners': collection.distinct('owner')
+            'total_documents': collection.estimated_document_count(),
+            'unique_applications': len(applications),
+            'unique_environments': len(environments),
+            'unique_owners': len(owners),
+            'applications': applications,
+            'environments': environments,
+            'owners': owners
         }
 
         logger.info(f"Collection statistics: {stats}")
@@ -357,16 +645,23 @@ def query_by_filters(
     application_name: str = None,
     environment: str = None,
     owner: str = None,
-    collection_name: str = None
+    collection_name: str = None,
+    covered: bool = False
 ) -> List[Dict]:
     """
     Query documents with filters (useful for dashboards).
 
+    With covered=True only applicationName, environment and owner are
+    returned, and the query is answered from the app/env/owner index without
+    fetching documents. The index is partial, so it is only hinted when
+    application_name is given.
+
     Args:
         application_name: Filter by application name
         environment: Filter by environment
         owner: Filter by owner
         collection_name: MongoDB collection name (default from config)
+        covered: Return only the indexed fields (covered query)
 
     Returns:
         List of matching documents
@@ -382,7 +677,14 @@ def query_by_filters(
         query['owner'] = owner
 
     try:
-        results = list(collection.find(query))
+        if covered:
+            cursor = collection.find(query, projection=config.MONGODB_COVERED_PROJECTION)
+            if application_name:
+                cursor = cursor.hint(config.MONGODB_COVERED_INDEX)
+        else:
+            cursor = collection.find(query)
+
+        results = list(cursor)
         logger.info(f"Query returned {len(results)} documents")
         return results
 
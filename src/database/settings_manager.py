@@ -1,7 +1,9 @@
 """
 Settings Manager - Store and retrieve application settings in MongoDB
 """
+import copy
 import logging
+import time
 from typing import Dict, Any, Optional
 from datetime import datetime
 from pymongo.collection import Collection
@@ -18,13 +20,35 @@ logger = logging.getLogger(__name__)
 # Settings collection name
 SETTINGS_COLLECTION = "app_settings"
 
+# Loaded settings are reused for this long; saves and clears invalidate them
+SETTINGS_CACHE_TTL_SECONDS = 60
+
+# (setting_type, user_id[, preference_name]) -> (loaded_at, value)
+_settings_cache = {}
+_MISSING = object()
+
+
+def _cache_get(key: tuple) -> Any:
+    """Return a cached value, or _MISSING if absent or expired"""
+    entry = _settings_cache.get(key)
+    if entry is None or time.monotonic() - entry[0] > SETTINGS_CACHE_TTL_SECONDS:
+        return _MISSING
+    return entry[1]
+
+
+def _cache_put(key: tuple, value: Any) -> None:
+    """Cache a loaded value"""
+    _settings_cache[key] = (time.monotonic(), value)
+
+
+def _cache_invalidate(key: tuple) -> None:
+    """Forget a cached value after it is written"""
+    _settings_cache.pop(key, None)
+
 
 def get_settings_collection() -> Collection:
-    """Get the settings collection"""
-    from pymongo import MongoClient
-    client = MongoClient(config.MONGODB_URI)
-    db = client[config.MONGODB_DATABASE]
-    return db[SETTINGS_COLLECTION]
+    """Get the settings collection (through the shared per-process client)"""
+    return get_collection(SETTINGS_COLLECTION)
 
 
 def save_llm_settings(
@@ -68,6 +92,7 @@ def save_llm_settings(
             upsert=True
         )
 
+        _cache_invalidate(("llm_config", user_id))
         logger.info(f"LLM settings saved for user: {user_id}, provider: {provider}")
         return True
 
@@ -86,6 +111,11 @@ def load_llm_settings(user_id: str = "default") -> Optional[Dict[str, Any]]:
     Returns:
         Dictionary with settings or None if not found
     """
+    cache_key = ("llm_config", user_id)
+    cached = _cache_get(cache_key)
+    if cached is not _MISSING:
+        return dict(cached) if cached else None
+
     try:
         collection = get_settings_collection()
 
@@ -96,14 +126,17 @@ def load_llm_settings(user_id: str = "default") -> Optional[Dict[str, Any]]:
 
         if settings_doc:
             logger.info(f"LLM settings loaded for user: {user_id}")
-            return {
+            settings = {
                 "provider": settings_doc.get("provider"),
                 "api_key": settings_doc.get("api_key"),
                 "model": settings_doc.get("model"),
                 "last_updated": settings_doc.get("last_updated")
             }
+            _cache_put(cache_key, settings)
+            return dict(settings)
         else:
             logger.info(f"No LLM settings found for user: {user_id}")
+            _cache_put(cache_key, None)
             return None
 
     except Exception as e:
@@ -129,6 +162,7 @@ def clear_llm_settings(user_id: str = "default") -> bool:
             "setting_type": "llm_config"
         })
 
+        _cache_invalidate(("llm_config", user_id))
         logger.info(f"LLM settings cleared for user: {user_id}")
         return result.deleted_count > 0
 
@@ -175,6 +209,7 @@ def save_user_preference(
             upsert=True
         )
 
+        _cache_invalidate(("user_preference", user_id, preference_name))
         logger.info(f"Preference '{preference_name}' saved for user: {user_id}")
         return True
 
@@ -197,6 +232,12 @@ def load_user_preference(
     Returns:
         Preference value or None if not found
     """
+    cache_key = ("user_preference", user_id, preference_name)
+    cached = _cache_get(cache_key)
+    if cached is not _MISSING:
+        # Preferences may be dicts or lists; callers get their own copy
+        return copy.deepcopy(cached)
+
     try:
         collection = get_settings_collection()
 
@@ -206,10 +247,9 @@ def load_user_preference(
             "preference_name": preference_name
         })
 
-        if preference_doc:
-            return preference_doc.get("preference_value")
-        else:
-            return None
+        value = preference_doc.get("preference_value") if preference_doc else None
+        _cache_put(cache_key, value)
+        return copy.deepcopy(value)
 
     except Exception as e:
         logger.error(f"Error loading preference: {e}")
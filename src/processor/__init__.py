@@ -1,12 +1,14 @@
 """
 Data processing module for Excel Tags Parser
 """
-from .excel_reader import read_excel_in_chunks, get_total_rows
+from .excel_reader import read_excel_in_chunks, read_excel_as_dicts, prefetch_chunks, get_total_rows
 from .tag_parser import parse_tags, process_dataframe
 from .excel_writer import write_to_excel
 
 __all__ = [
     'read_excel_in_chunks',
+    'read_excel_as_dicts',
+    'prefetch_chunks',
     'get_total_rows',
     'parse_tags',
     'process_dataframe',
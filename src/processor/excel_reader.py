@@ -3,8 +3,11 @@ Excel file reading module with chunked processing support
 """
 import pandas as pd
 import logging
-from typing import Generator, Tuple, Optional
-from datetime import datetime
+import queue
+import threading
+from itertools import islice
+from typing import Any, Callable, Dict, Generator, Iterable, Iterator, List, Tuple, Optional
+from datetime import date, datetime
 import sys
 import os
 
@@ -14,6 +17,33 @@ import config
 
 logger = logging.getLogger(__name__)
 
+try:
+    import python_calamine
+except ImportError:  # python-calamine is optional; openpyxl is used instead
+    python_calamine = None
+
+
+def get_excel_backend() -> str:
+    """
+    Resolve the Excel parsing backend from config.EXCEL_BACKEND.
+
+    Returns:
+        'calamine' or 'openpyxl'
+    """
+    backend = config.EXCEL_BACKEND
+    if backend not in config.EXCEL_BACKENDS:
+        logger.warning(f"Unknown EXCEL_BACKEND '{backend}', using auto")
+        backend = 'auto'
+
+    if backend == 'auto':
+        return 'calamine' if python_calamine is not None else 'openpyxl'
+
+    if backend == 'calamine' and python_calamine is None:
+        logger.warning("EXCEL_BACKEND is 'calamine' but python-calamine is not installed, using openpyxl")
+        return 'openpyxl'
+
+    return backend
+
 
 def extract_start_date_from_summary(file_path: str) -> Optional[str]:
     """
@@ -77,6 +107,71 @@ def extract_start_date_from_summary(file_path: str) -> Optional[str]:
         return None
 
 
+def is_large_file(file_path: str) -> bool:
+    """
+    Check whether a file should be read with the streaming (row-by-row) reader.
+
+    XLSX files are compressed, so a file well under MAX_FILE_SIZE_MB can still
+    expand to gigabytes when loaded into a DataFrame.
+
+    Args:
+        file_path: Path to the Excel file
+
+    Returns:
+        True if the file is larger than STREAM_THRESHOLD_MB and streaming is enabled
+    """
+    if not config.USE_STREAMING_READER:
+        return False
+    return os.path.getsize(file_path) > config.STREAM_THRESHOLD_MB * 1024 * 1024
+
+
+def iter_column_values(
+    file_path: str,
+    column_name: str,
+    sheet_name: str = 'Data',
+    max_rows: int = None
+) -> Generator[Any, None, None]:
+    """
+    Stream the values of a single column without materializing the sheet.
+
+    Memory use is bounded by the width of one row regardless of file size.
+
+    Args:
+        file_path: Path to the Excel file
+        column_name: Header name of the column to read
+        sheet_name: Name of the sheet to read (default: 'Data')
+        max_rows: Maximum number of data rows to read (None = all rows)
+
+    Yields:
+        Cell values of the column, one per data row
+
+    Raises:
+        KeyError: If the column is not present in the header row
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        if sheet_name in wb.sheetnames:
+            ws = wb[sheet_name]
+        else:
+            logger.warning(f"Sheet '{sheet_name}' not found, using active sheet")
+            ws = wb.active
+
+        rows = ws.iter_rows(values_only=True)
+        header = list(next(rows, ()))
+        if column_name not in header:
+            raise KeyError(f"Column '{column_name}' not found. Available: {header}")
+        col_idx = header.index(column_name)
+
+        for row_num, row in enumerate(rows):
+            if max_rows is not None and row_num >= max_rows:
+                break
+            yield row[col_idx] if col_idx < len(row) else None
+    finally:
+        wb.close()
+
+
 def get_total_rows(file_path: str, sheet_name: str = 'Data') -> int:
     """
     Get the total number of rows in an Excel file without loading the entire file.
@@ -89,6 +184,15 @@ def get_total_rows(file_path: str, sheet_name: str = 'Data') -> int:
         Total number of rows in the file
     """
     try:
+        if get_excel_backend() == 'calamine':
+            wb = python_calamine.CalamineWorkbook.from_path(file_path)
+            if sheet_name not in wb.sheet_names:
+                logger.warning(f"Sheet '{sheet_name}' not found, using first sheet")
+                sheet_name = wb.sheet_names[0]
+            total_rows = wb.get_sheet_by_name(sheet_name).height - 1  # Subtract 1 for header row
+            wb.close()
+            return total_rows
+
         # Use openpyxl to get row count efficiently
         from openpyxl import load_workbook
         wb = load_workbook(file_path, read_only=True)
@@ -111,6 +215,61 @@ def get_total_rows(file_path: str, sheet_name: str = 'Data') -> int:
         return 0
 
 
+def _calamine_value(value: Any) -> Any:
+    """Convert a calamine cell value to what openpyxl would return for it."""
+    if value == '':
+        return None  # calamine returns '' for empty cells
+    if type(value) is date:
+        return datetime(value.year, value.month, value.day)  # calamine returns date for midnight datetimes
+    return value
+
+
+def _open_sheet_rows(
+    file_path: str,
+    sheet_name: str
+) -> Tuple[int, List[Any], Iterator[tuple], Callable[[], None]]:
+    """
+    Open a sheet with the configured backend for row-by-row reading.
+
+    Args:
+        file_path: Path to the Excel file
+        sheet_name: Name of the sheet to read (falls back to the first/active sheet)
+
+    Returns:
+        Tuple of (total data rows, header, data row iterator, close function)
+    """
+    if get_excel_backend() == 'calamine':
+        wb = python_calamine.CalamineWorkbook.from_path(file_path)
+        if sheet_name in wb.sheet_names:
+            logger.info(f"Successfully found sheet '{sheet_name}'")
+        else:
+            logger.warning(f"Sheet '{sheet_name}' not found, using first sheet")
+            sheet_name = wb.sheet_names[0]
+        ws = wb.get_sheet_by_name(sheet_name)
+
+        rows = ws.iter_rows()
+        header = list(next(rows, []))
+        data_rows = (tuple(map(_calamine_value, row)) for row in rows)
+        return ws.height - 1, header, data_rows, wb.close
+
+    from openpyxl import load_workbook
+
+    # Load workbook in read-only mode for memory efficiency
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+
+    # Get the specified sheet
+    if sheet_name in wb.sheetnames:
+        ws = wb[sheet_name]
+        logger.info(f"Successfully found sheet '{sheet_name}'")
+    else:
+        logger.warning(f"Sheet '{sheet_name}' not found, using active sheet")
+        ws = wb.active
+
+    rows = ws.iter_rows(values_only=True)
+    header = list(next(rows, ()))
+    return ws.max_row - 1, header, rows, wb.close
+
+
 def read_excel_in_chunks(
     file_path: str,
     chunk_size: int = None,
@@ -120,11 +279,13 @@ def read_excel_in_chunks(
     Read Excel file in chunks to optimize memory usage for large files.
 
     This function yields chunks of data as DataFrames along with the total row count,
-    allowing for progress tracking and memory-efficient processing.
+    allowing for progress tracking and memory-efficient processing. The sheet is
+    parsed with the backend selected by config.EXCEL_BACKEND.
 
     Args:
         file_path: Path to the Excel file
-        chunk_size: Number of rows per chunk (default from config)
+        chunk_size: Number of rows per chunk (default: sized from available memory
+                    and the sheet width once the header row is known)
         sheet_name: Name of the sheet to read (default: 'Data')
 
     Yields:
@@ -135,57 +296,142 @@ def read_excel_in_chunks(
         ...     process_chunk(chunk)
         ...     print(f"Processed {len(chunk)} rows out of {total}")
     """
-    if chunk_size is None:
-        chunk_size = config.CHUNK_SIZE
-
-    logger.info(f"Reading Excel file: {file_path} from sheet '{sheet_name}' with chunk size: {chunk_size}")
+    logger.info(f"Reading Excel file: {file_path} from sheet '{sheet_name}'")
 
     try:
-        from openpyxl import load_workbook
+        total_rows, header, rows, close = _open_sheet_rows(file_path, sheet_name)
 
-        # Load workbook in read-only mode for memory efficiency
-        wb = load_workbook(file_path, read_only=True, data_only=True)
+        # Refine chunk size now that the row width is known
+        if chunk_size is None:
+            chunk_size = config.get_chunk_size(len(header) * config.CHUNK_CELL_BYTES)
+        logger.info(f"Using chunk size: {chunk_size}")
 
-        # Get the specified sheet
-        if sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-            logger.info(f"Successfully found sheet '{sheet_name}'")
-        else:
-            logger.warning(f"Sheet '{sheet_name}' not found, using active sheet")
-            ws = wb.active
+        # Read data in chunks from a single pass over the sheet
+        try:
+            while True:
+                rows_data = list(islice(rows, chunk_size))
 
-        # Get total rows
-        total_rows = ws.max_row - 1  # Exclude header
+                if not rows_data:
+                    break
 
-        # Get header row
-        header = [cell.value for cell in next(ws.iter_rows(min_row=1, max_row=1))]
+                # Create DataFrame from chunk
+                chunk_df = pd.DataFrame(rows_data, columns=header)
 
-        # Read data in chunks
-        current_row = 2  # Start from row 2 (after header)
+                logger.debug(f"Yielding chunk with {len(chunk_df)} rows")
+                yield chunk_df, total_rows
+        finally:
+            close()
 
-        while current_row <= ws.max_row:
-            rows_data = []
+    except Exception as e:
+        logger.error(f"Error reading Excel file: {e}")
+        raise
 
-            # Read chunk_size rows
-            for row in ws.iter_rows(min_row=current_row, max_row=current_row + chunk_size - 1, values_only=True):
-                rows_data.append(row)
+
+def read_excel_as_dicts(
+    file_path: str,
+    chunk_size: int = None,
+    sheet_name: str = 'Data'
+) -> Generator[Tuple[List[Dict[str, Any]], int], None, None]:
+    """
+    Read Excel file in chunks of plain dict rows, without building DataFrames.
+
+    For consumers that only need records (e.g.
+    mongodb_operations.insert_records_to_mongodb on a sheet that needs no tag
+    parsing). Empty cells are None and dates are ISO 8601 strings, matching
+    mongodb_operations.clean_dataframe.
+
+    Args:
+        file_path: Path to the Excel file
+        chunk_size: Number of rows per chunk (default: sized as in read_excel_in_chunks)
+        sheet_name: Name of the sheet to read (default: 'Data')
+
+    Yields:
+        Tuple of (list of row dicts, total_rows)
+    """
+    logger.info(f"Reading Excel file as records: {file_path} from sheet '{sheet_name}'")
+
+    total_rows, header, rows, close = _open_sheet_rows(file_path, sheet_name)
+
+    if chunk_size is None:
+        chunk_size = config.get_chunk_size(len(header) * config.CHUNK_CELL_BYTES)
+
+    try:
+        while True:
+            rows_data = list(islice(rows, chunk_size))
 
             if not rows_data:
                 break
 
-            # Create DataFrame from chunk
-            chunk_df = pd.DataFrame(rows_data, columns=header)
+            records = [
+                dict(zip(header, (
+                    value.strftime('%Y-%m-%dT%H:%M:%S') if isinstance(value, datetime) else value
+                    for value in row
+                )))
+                for row in rows_data
+            ]
+            yield records, total_rows
+    finally:
+        close()
 
-            logger.debug(f"Yielding chunk with {len(chunk_df)} rows")
-            yield chunk_df, total_rows
 
-            current_row += chunk_size
+def prefetch_chunks(chunks: Iterable[Any], maxsize: int = None) -> Generator[Any, None, None]:
+    """
+    Read chunks ahead in a background thread so parsing overlaps processing.
 
-        wb.close()
+    Items are passed through unchanged and in order; at most maxsize are
+    buffered. An exception raised while reading is re-raised in the caller.
+    Closing the generator early stops the reader thread and closes chunks.
 
-    except Exception as e:
-        logger.error(f"Error reading Excel file: {e}")
-        raise
+    Args:
+        chunks: Chunk iterator, e.g. from read_excel_in_chunks
+        maxsize: Chunks to read ahead (default: config.READ_PREFETCH_CHUNKS)
+
+    Yields:
+        The items of chunks
+    """
+    if maxsize is None:
+        maxsize = config.READ_PREFETCH_CHUNKS
+
+    buffer = queue.Queue(maxsize=max(1, maxsize))
+    stop = threading.Event()
+    done = object()
+
+    def put(message) -> bool:
+        # Wait for room, giving up once the consumer has gone away
+        while not stop.is_set():
+            try:
+                buffer.put(message, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def read():
+        try:
+            for item in chunks:
+                if not put((item, None)):
+                    return
+            put((done, None))
+        except Exception as e:
+            put((None, e))
+        finally:
+            close = getattr(chunks, 'close', None)
+            if close is not None:
+                close()
+
+    reader = threading.Thread(target=read, name='excel-prefetch', daemon=True)
+    reader.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if error is not None:
+                raise error
+            if item is done:
+                return
+            yield item
+    finally:
+        stop.set()
+        reader.join()
 
 
 def read_excel_file(file_path: str, sheet_name: str = 'Data') -> pd.DataFrame:
@@ -204,7 +450,7 @@ def read_excel_file(file_path: str, sheet_name: str = 'Data') -> pd.DataFrame:
     logger.info(f"Reading entire Excel file: {file_path} from sheet '{sheet_name}'")
 
     try:
-        df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl')
+        df = pd.read_excel(file_path, sheet_name=sheet_name, engine=get_excel_backend())
         logger.info(f"Successfully read {len(df)} rows")
         return df
     except Exception as e:
@@ -3,9 +3,11 @@ Excel file writing module for processed data with progress tracking
 """
 import pandas as pd
 import logging
-from typing import List, Callable, Optional
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
 import sys
 import os
+import tempfile
+from contextlib import contextmanager
 import xlsxwriter
 
 # Add parent directory to path for imports
@@ -80,54 +82,8 @@ def write_dataframe_to_excel_optimized(
     logger.info(f"Writing {total_rows:,} rows to {output_path} using xlsxwriter engine")
 
     try:
-        # Create workbook with xlsxwriter
-        workbook = xlsxwriter.Workbook(output_path, {'constant_memory': True})
-        worksheet = workbook.add_worksheet(sheet_name)
-
-        # Define formats for better performance
-        header_format = workbook.add_format({
-            'bold': True,
-            'bg_color': '#D3D3D3',
-            'border': 1
-        })
-
-        # Write headers
-        columns = df.columns.tolist()
-        for col_idx, col_name in enumerate(columns):
-            worksheet.write(0, col_idx, col_name, header_format)
-
-        if progress_callback:
-            progress_callback(0, total_rows, "Writing headers...")
-
-        # Write data in batches
-        rows_written = 0
-        for start_idx in range(0, total_rows, batch_size):
-            end_idx = min(start_idx + batch_size, total_rows)
-            batch_df = df.iloc[start_idx:end_idx]
-
-            # Write batch rows
-            for batch_row_idx, (_, row) in enumerate(batch_df.iterrows()):
-                excel_row = start_idx + batch_row_idx + 1  # +1 for header row
-                for col_idx, col_name in enumerate(columns):
-                    value = row[col_name]
-                    # Handle NaN/None values
-                    if pd.isna(value):
-                        worksheet.write(excel_row, col_idx, '')
-                    else:
-                        worksheet.write(excel_row, col_idx, value)
-
-            rows_written = end_idx
-
-            # Report progress
-            if progress_callback:
-                progress_callback(
-                    rows_written,
-                    total_rows,
-                    f"Writing rows {rows_written:,} / {total_rows:,} ({(rows_written/total_rows*100):.1f}%)"
-                )
-
-        # Close workbook
-        workbook.close()
+        batches = (df.iloc[start_idx:start_idx + batch_size] for start_idx in range(0, total_rows, batch_size))
+        _write_frames(batches, df.columns.tolist(), total_rows, output_path, sheet_name, progress_callback)
 
         if progress_callback:
             progress_callback(total_rows, total_rows, f"✅ Successfully wrote {total_rows:,} rows to Excel!")
@@ -139,8 +95,143 @@ def write_dataframe_to_excel_optimized(
         raise IOError(f"Failed to write Excel file: {e}")
 
 
+def _write_frames(
+    frames: Iterable[pd.DataFrame],
+    columns: List[str],
+    total_rows: int,
+    output_path: str,
+    sheet_name: str = 'Sheet1',
+    progress_callback: Optional[Callable[[int, int, str], None]] = None,
+    progress_every: int = 5000
+) -> None:
+    """
+    Write DataFrames one after another as the rows of a single worksheet.
+
+    The workbook is opened in xlsxwriter's constant_memory mode, so each row
+    is flushed to disk once the next one starts; only the frame being written
+    is held in memory. Frames missing some of `columns` get empty cells there.
+
+    Args:
+        frames: DataFrames to write, in row order
+        columns: Header row (union of the frames' columns)
+        total_rows: Total number of rows across all frames (for progress)
+        output_path: Path where the Excel file will be saved
+        sheet_name: Name of the worksheet (default: 'Sheet1')
+        progress_callback: Optional callback function(rows_written, total_rows, message)
+        progress_every: Report progress every this many rows (default: 5000), however
+                        the rows are split into frames
+    """
+    def report(rows_written):
+        progress_callback(
+            rows_written,
+            total_rows,
+            f"Writing rows {rows_written:,} / {total_rows:,} ({(rows_written/total_rows*100):.1f}%)"
+        )
+
+    # Create workbook with xlsxwriter
+    workbook = xlsxwriter.Workbook(output_path, {'constant_memory': True})
+    worksheet = workbook.add_worksheet(sheet_name)
+
+    # Define formats for better performance
+    header_format = workbook.add_format({
+        'bold': True,
+        'bg_color': '#D3D3D3',
+        'border': 1
+    })
+
+    # Write headers
+    for col_idx, col_name in enumerate(columns):
+        worksheet.write(0, col_idx, col_name, header_format)
+
+    if progress_callback:
+        progress_callback(0, total_rows, "Writing headers...")
+
+    # Write data frame by frame
+    rows_written = 0
+    for frame in frames:
+        if frame.columns.tolist() != columns:
+            frame = frame.reindex(columns=columns)
+
+        for row in frame.itertuples(index=False, name=None):
+            excel_row = rows_written + 1  # +1 for header row
+            for col_idx, value in enumerate(row):
+                # Handle NaN/None values
+                if pd.isna(value):
+                    worksheet.write(excel_row, col_idx, '')
+                else:
+                    worksheet.write(excel_row, col_idx, value)
+            rows_written += 1
+
+            # Report progress
+            if progress_callback and total_rows and rows_written % progress_every == 0:
+                report(rows_written)
+
+    if progress_callback and total_rows and rows_written % progress_every:
+        report(rows_written)
+
+    # Close workbook
+    workbook.close()
+
+
+def _spool_chunks(chunks: Iterable[pd.DataFrame], spool_dir: str) -> Tuple[List[str], List[str], int]:
+    """
+    Save chunks to pickle files as they arrive, keeping none of them in memory.
+
+    Returns:
+        Tuple of (spool file paths in order, union of columns in order of
+        first appearance, total number of rows)
+    """
+    paths = []
+    columns = {}
+    total_rows = 0
+    for chunk in chunks:
+        path = os.path.join(spool_dir, f"chunk_{len(paths):06d}.pkl")
+        chunk.to_pickle(path)
+        paths.append(path)
+        columns.update(dict.fromkeys(chunk.columns))
+        total_rows += len(chunk)
+    return paths, list(columns), total_rows
+
+
+def _load_chunks(paths: List[str]) -> Iterator[pd.DataFrame]:
+    """Read spooled chunks back one at a time"""
+    for path in paths:
+        yield pd.read_pickle(path)
+
+
+@contextmanager
+def _collected_chunks(chunks: Iterable[pd.DataFrame]):
+    """
+    Make chunks writable under one header: yields (frames, columns, total_rows).
+
+    A list is used as is. Any other iterable is spooled to temporary files
+    first (the header, the union of all chunks' columns in order of first
+    appearance, must be known before the first row), and `frames` reads the
+    chunks back one at a time. The files are removed on exit.
+
+    Raises:
+        ValueError: If there are no chunks
+    """
+    with tempfile.TemporaryDirectory(prefix="excel_chunks_") as spool_dir:
+        if isinstance(chunks, list):
+            frames = chunks
+            columns = list(dict.fromkeys(col for chunk in chunks for col in chunk.columns))
+            total_rows = sum(len(chunk) for chunk in chunks)
+            chunk_count = len(chunks)
+        else:
+            paths, columns, total_rows = _spool_chunks(chunks, spool_dir)
+            frames = _load_chunks(paths)
+            chunk_count = len(paths)
+
+        if not chunk_count:
+            raise ValueError("No chunks provided to write")
+
+        logger.info(f"Writing {chunk_count} chunks ({total_rows:,} total rows)")
+        yield frames, columns, total_rows
+
+
 def write_chunks_to_excel(
-    chunks: List[pd.DataFrame],
+    chunks: Iterable[pd.DataFrame],
     output_path: str,
     sheet_name: str = 'Sheet1',
     progress_callback: Optional[Callable[[int, int, str], None]] = None
@@ -148,52 +239,45 @@ def write_chunks_to_excel(
     """
     Write multiple DataFrame chunks to a single Excel file with progress tracking.
 
-    This function concatenates all chunks and writes them to Excel with real-time progress.
-    Use this when you've processed data in chunks.
+    Chunks are written one after another under a header holding every
+    column found in any chunk (as pd.concat would), without combining them
+    into one DataFrame. A list is written directly. Any other iterable (e.g.
+    a generator yielding chunks as they are processed) is first spooled to
+    temporary files, because the header must be written before the first
+    row; peak memory then stays at about one chunk however large the file.
 
     Args:
-        chunks: List of DataFrame chunks to write
+        chunks: DataFrame chunks to write, as a list or any iterable
         output_path: Path where the Excel file will be saved
         sheet_name: Name of the worksheet (default: 'Sheet1')
         progress_callback: Optional callback function(rows_written, total_rows, message)
                           to report progress
 
     Raises:
-        ValueError: If chunks list is empty
+        ValueError: If no chunks are provided
         IOError: If file cannot be written
     """
-    if not chunks:
-        raise ValueError("No chunks provided to write")
-
-    logger.info(f"Combining {len(chunks)} chunks for writing")
-
     try:
-        # Concatenate all chunks
         if progress_callback:
-            progress_callback(0, 100, f"Combining {len(chunks)} chunks...")
+            progress_callback(0, 100, "Collecting chunks...")
 
-        combined_df = pd.concat(chunks, ignore_index=True)
-        total_rows = len(combined_df)
-        logger.info(f"Combined {total_rows:,} total rows")
+        with _collected_chunks(chunks) as (frames, columns, total_rows):
+            if progress_callback:
+                progress_callback(10, 100, f"Collected {total_rows:,} rows, starting write...")
 
-        if progress_callback:
-            progress_callback(10, 100, f"Combined {total_rows:,} rows, starting write...")
+            # Wrap the progress callback to convert row-based progress to percentage
+            def row_progress_callback(rows_written, total, message):
+                # Map rows_written to 10-100% range (0-10% was collecting)
+                progress_pct = 10 + int((rows_written / total) * 90) if total else 100
+                if progress_callback:
+                    progress_callback(progress_pct, 100, message)
 
-        # Write to Excel with optimized batch writing
-        # Wrap the progress callback to convert row-based progress to percentage
-        def row_progress_callback(rows_written, total, message):
-            # Map rows_written to 10-100% range (0-10% was combining)
-            progress_pct = 10 + int((rows_written / total) * 90)
-            if progress_callback:
-                progress_callback(progress_pct, 100, message)
+            try:
+                _write_frames(frames, columns, total_rows, output_path, sheet_name, row_progress_callback)
+            except Exception as e:
+                raise IOError(f"Failed to write Excel file: {e}")
 
-        write_dataframe_to_excel_optimized(
-            combined_df,
-            output_path,
-            sheet_name,
-            batch_size=5000,
-            progress_callback=row_progress_callback
-        )
+            logger.info(f"Successfully wrote {total_rows:,} rows to {output_path}")
 
         if progress_callback:
             progress_callback(100, 100, "Excel file created successfully!")
@@ -203,6 +287,88 @@ def write_chunks_to_excel(
         raise
 
 
+def write_chunks_to_csv(chunks: Iterable[pd.DataFrame], output_path: str) -> None:
+    """
+    Write DataFrame chunks to a single CSV file, appending one chunk at a time.
+
+    Args:
+        chunks: DataFrame chunks to write, as a list or any iterable
+        output_path: Path where the CSV file will be saved
+
+    Raises:
+        ValueError: If no chunks are provided
+        IOError: If file cannot be written
+    """
+    with _collected_chunks(chunks) as (frames, columns, total_rows):
+        try:
+            for i, frame in enumerate(frames):
+                frame.reindex(columns=columns).to_csv(
+                    output_path,
+                    mode='w' if i == 0 else 'a',
+                    header=i == 0,
+                    index=False
+                )
+        except Exception as e:
+            logger.error(f"Error writing CSV file: {e}")
+            raise IOError(f"Failed to write CSV file: {e}")
+
+        logger.info(f"Successfully wrote {total_rows:,} rows to {output_path}")
+
+
+def write_chunks_to_parquet(chunks: Iterable[pd.DataFrame], output_path: str) -> None:
+    """
+    Write DataFrame chunks to a single zstd-compressed Parquet file (needs pyarrow).
+
+    Chunks are combined first: Parquet needs one schema for the whole file
+    and tag columns may appear in any chunk.
+
+    Args:
+        chunks: DataFrame chunks to write, as a list or any iterable
+        output_path: Path where the Parquet file will be saved
+
+    Raises:
+        ValueError: If no chunks are provided
+        IOError: If file cannot be written
+    """
+    with _collected_chunks(chunks) as (frames, columns, total_rows):
+        try:
+            combined_df = pd.concat(list(frames), ignore_index=True)[columns]
+            combined_df.to_parquet(output_path, engine='pyarrow', compression='zstd', index=False)
+        except Exception as e:
+            logger.error(f"Error writing Parquet file: {e}")
+            raise IOError(f"Failed to write Parquet file: {e}")
+
+        logger.info(f"Successfully wrote {total_rows:,} rows to {output_path}")
+
+
+def write_chunks(
+    chunks: Iterable[pd.DataFrame],
+    output_path: str,
+    sheet_name: str = 'Sheet1',
+    progress_callback: Optional[Callable[[int, int, str], None]] = None
+) -> None:
+    """
+    Write DataFrame chunks in the format given by the output file extension.
+
+    '.csv' and '.parquet' skip the xlsx encoder (much faster, and Parquet
+    files are far smaller); any other extension writes an Excel file.
+
+    Args:
+        chunks: DataFrame chunks to write, as a list or any iterable
+        output_path: Path of the output file
+        sheet_name: Name of the worksheet (Excel only)
+        progress_callback: Optional callback function(rows_written, total_rows, message)
+                          (Excel only)
+    """
+    extension = os.path.splitext(output_path)[1].casefold()
+    if extension == '.csv':
+        write_chunks_to_csv(chunks, output_path)
+    elif extension == '.parquet':
+        write_chunks_to_parquet(chunks, output_path)
+    else:
+        write_chunks_to_excel(chunks, output_path, sheet_name, progress_callback)
+
+
 def append_to_excel(
     df: pd.DataFrame,
     output_path: str,
@@ -1,10 +1,11 @@
 """
 Tag parsing module for dynamically extracting ALL key-value pairs from Tags column
 """
+import numpy as np
 import pandas as pd
 import re
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 import sys
 import os
 
@@ -12,10 +13,54 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 import config
 
-logger = logging.getLogger(__name__)
+logger = config.get_logger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pyarrow is optional; tags are then parsed row by row
+    pa = None
 
 # Pre-compile regex patterns for better performance
 KEY_VALUE_PATTERN = re.compile(r'([^:,;|]+):([^:,;|]+)')
+ESCAPED_KEY_VALUE_PATTERN = re.compile(r'"([^"]+)"\s*:\s*"([^"]*)"')
+# Key-value pairs are split on ',' and ';' only - '|' may appear inside values
+PAIR_SEPARATOR_PATTERN = re.compile(r'[,;]')
+
+
+class ChunkBuffer:
+    """
+    Column-oriented (struct-of-arrays) buffer for parsed tag values of one chunk.
+
+    Each parsed column is an object array preallocated to the chunk length and
+    written by row position, so building the chunk's DataFrame does not go
+    through a list of per-row dicts. Columns keep the order they are filled in.
+    """
+    __slots__ = ('columns', 'n')
+
+    def __init__(self, capacity: int):
+        self.columns = {}
+        self.n = capacity
+
+    def fill(self, column: str, rows: np.ndarray, values: List[Any]) -> None:
+        """
+        Store parsed values of one column for many rows, creating the column if needed.
+
+        Values of config.INTERN_COLUMNS are interned so repeated values
+        (e.g. 'production') share a single string object.
+        """
+        column_values = self.columns.get(column)
+        if column_values is None:
+            column_values = self.columns[column] = np.full(self.n, None, dtype=object)
+        if column in config.INTERN_COLUMNS:
+            values = [sys.intern(value) if type(value) is str else value for value in values]
+        column_values[rows] = values
+
+    def to_frame(self, index: pd.Index = None) -> pd.DataFrame:
+        """Materialize the buffer as a DataFrame (one column per parsed key)."""
+        if index is None:
+            index = pd.RangeIndex(self.n)
+        return pd.DataFrame(self.columns, index=index)
 
 
 def format_column_name(key: str) -> str:
@@ -134,10 +179,10 @@ def parse_tags(tag_string: Any) -> Dict[str, str]:
 
         # Strategy 4: No recognizable format
         else:
-            logger.debug(f"No matching format for tag: {tag_string}")
+            logger.debug("No matching format for tag: %s", tag_string)
 
     except Exception as e:
-        logger.warning(f"Error parsing tag '{tag_string}': {e}")
+        logger.warning("Error parsing tag '%s': %s", tag_string, e)
 
     return result
 
@@ -155,8 +200,7 @@ def _parse_escaped_key_value_format(tag_string: str) -> Dict[str, str]:
 
     # Use regex to extract quoted key-value pairs
     # Pattern: "key":"value"
-    pattern = r'"([^"]+)"\s*:\s*"([^"]*)"'
-    matches = re.findall(pattern, tag_string)
+    matches = ESCAPED_KEY_VALUE_PATTERN.findall(tag_string)
 
     for key, value in matches:
         key_raw = key.strip()
@@ -183,7 +227,7 @@ def _parse_key_value_format(tag_string: str) -> Dict[str, str]:
     result = {}
 
     # Split by common separators
-    pairs = re.split(r'[,;]', tag_string)
+    pairs = PAIR_SEPARATOR_PATTERN.split(tag_string)
 
     for pair in pairs:
         pair = pair.strip()
@@ -271,13 +315,121 @@ def _parse_json_format(tag_string: str) -> Dict[str, str]:
             result = _parse_escaped_key_value_format(tag_string)
 
     except json.JSONDecodeError as e:
-        logger.debug(f"Not valid JSON, trying escaped format: {e}")
+        logger.debug("Not valid JSON, trying escaped format: %s", e)
         # If JSON parsing fails, try escaped key-value format
         result = _parse_escaped_key_value_format(tag_string)
 
     return result
 
 
+def _is_plain_key_value(tag: Any) -> bool:
+    """
+    Check whether parse_tags would use the plain key:value strategy for a tag.
+
+    Such tags have no quotes, escapes or JSON braces, so they can be split
+    column-wise by _split_key_values with the same result.
+    """
+    if type(tag) is not str or ':' not in tag or '"' in tag or '\\' in tag:
+        return False
+    tag = tag.strip()
+    return not (tag.startswith('{') and tag.endswith('}'))
+
+
+def _split_key_values(tags: List[str]) -> Tuple[np.ndarray, List[str], np.ndarray]:
+    """
+    Split plain key:value tags for a whole column with Arrow compute kernels.
+
+    Mirrors _parse_key_value_format: pairs are split on ',' and ';', pairs
+    without ':' are skipped, and each pair is split on its first ':'.
+
+    Args:
+        tags: Tag strings accepted by _is_plain_key_value
+
+    Returns:
+        Tuple of (tag position per pair, column name per pair, value per pair)
+    """
+    pairs = pc.split_pattern_regex(pa.array(tags, pa.large_string()), PAIR_SEPARATOR_PATTERN.pattern)
+    positions = pc.list_parent_indices(pairs)
+    pairs = pc.list_flatten(pairs)
+
+    has_colon = pc.match_substring(pairs, ':')
+    positions = pc.filter(positions, has_colon)
+    key_value = pc.split_pattern(pc.filter(pairs, has_colon), ':', max_splits=1)
+
+    # Format each distinct key once
+    keys = pc.dictionary_encode(pc.utf8_trim_whitespace(pc.list_element(key_value, 0)))
+    column_names = np.array([format_column_name(key) for key in keys.dictionary.to_pylist()], dtype=object)
+    columns = column_names[keys.indices.to_numpy()]
+
+    values = pc.utf8_trim_whitespace(pc.list_element(key_value, 1)).to_numpy(zero_copy_only=False)
+    return positions.to_numpy(), columns, values
+
+
+def _parse_tag_column(tags: List[Any]) -> List[Tuple[str, np.ndarray, np.ndarray]]:
+    """
+    Parse a whole Tags column into per-column (rows, values) arrays.
+
+    Plain key:value tags are split column-wise with pyarrow when it is
+    installed; all other tags go through parse_tags row by row. The result
+    matches calling parse_tags on every row: later duplicates of a key
+    within a tag win, and columns are ordered by first appearance.
+
+    Args:
+        tags: Tag values of the chunk, in row order
+
+    Returns:
+        List of (column name, row positions, values), in column order
+    """
+    row_parts, column_parts, value_parts = [], [], []
+
+    if pa is not None:
+        plain = [_is_plain_key_value(tag) for tag in tags]
+        plain_rows = np.flatnonzero(plain)
+        if len(plain_rows):
+            positions, columns, values = _split_key_values([tags[row] for row in plain_rows])
+            row_parts.append(plain_rows[positions])
+            column_parts.append(columns)
+            value_parts.append(values)
+    else:
+        plain = [False] * len(tags)
+
+    rows, columns, values = [], [], []
+    for row, tag in enumerate(tags):
+        if not plain[row]:
+            for column, value in parse_tags(tag).items():
+                rows.append(row)
+                columns.append(column)
+                values.append(value)
+    row_parts.append(np.array(rows, dtype=np.int64))
+    column_parts.append(np.array(columns, dtype=object))
+    value_parts.append(np.array(values, dtype=object))
+
+    rows = np.concatenate(row_parts)
+    if not len(rows):
+        return []
+
+    # Back into row order (stable, so pairs keep their order within a row)
+    order = np.argsort(rows, kind='stable')
+    rows = rows[order]
+    columns = np.concatenate(column_parts)[order]
+    values = np.concatenate(value_parts)[order]
+
+    # Column codes in order of first appearance
+    codes, column_names = pd.factorize(columns)
+
+    # Keep the last value per (row, column), as a dict would
+    keys = rows * len(column_names) + codes
+    _, last_from_end = np.unique(keys[::-1], return_index=True)
+    keep = len(keys) - 1 - last_from_end
+    keep = keep[np.argsort(codes[keep], kind='stable')]
+    counts = np.bincount(codes[keep], minlength=len(column_names))
+
+    result = []
+    for column, selected in zip(column_names, np.split(keep, np.cumsum(counts)[:-1])):
+        result.append((column, rows[selected], values[selected]))
+    return result
+
+
 def process_dataframe(df: pd.DataFrame, tag_column: str = None, date_value: str = None) -> pd.DataFrame:
     """
     Process a DataFrame by parsing the Tags column and dynamically adding ALL extracted columns.
@@ -305,12 +457,13 @@ def process_dataframe(df: pd.DataFrame, tag_column: str = None, date_value: str
 
     logger.info(f"Processing {len(df)} rows with date value: {date_value}")
 
-    # Parse tags for each row (vectorized operation)
-    parsed_data = df[tag_column].apply(parse_tags)
-
-    # Convert list of dictionaries to DataFrame
+    # Parse the tags column into a column-oriented buffer
     # This will automatically create columns for ALL unique keys found
-    parsed_df = pd.DataFrame(parsed_data.tolist())
+    buffer = ChunkBuffer(len(df))
+    for column, rows, values in _parse_tag_column(df[tag_column].tolist()):
+        buffer.fill(column, rows, values)
+
+    parsed_df = buffer.to_frame(df.index)
 
     # Add Date column with the extracted date value
     parsed_df['Date'] = date_value
@@ -6,6 +6,7 @@ import sys
 import os
 import json
 import logging
+import orjson
 from typing import List, Dict, Any
 import requests
 
@@ -27,7 +28,8 @@ from mongodb_mcp_server import (
     query_resources,
     get_statistics,
     get_total_cost,
-    aggregate_by_field
+    aggregate_by_field,
+    run_tool
 )
 
 # Configure logging
@@ -166,11 +168,11 @@ AVAILABLE_TOOLS = [
 
 def truncate_large_response(data: Any, max_tokens: int = 2000) -> Any:
     """Truncate large responses to prevent context overflow"""
-    # Convert to JSON string to check size
-    json_str = json.dumps(data)
+    # Serialize to check size (UTF-8 bytes; close enough to characters for the estimate)
+    json_bytes = orjson.dumps(data, default=str)
 
     # Rough estimate: 1 token ≈ 4 characters
-    estimated_tokens = len(json_str) / 4
+    estimated_tokens = len(json_bytes) / 4
 
     if estimated_tokens > max_tokens:
         logger.warning(f"Response too large ({estimated_tokens:.0f} tokens), truncating...")
@@ -200,18 +202,16 @@ def call_mcp_tool(tool_name: str, parameters: Dict[str, Any]) -> Any:
     """Call an MCP tool function"""
     try:
         if tool_name == "get_available_fields":
-            import asyncio
-            result = asyncio.run(get_available_fields())
+            result = run_tool(get_available_fields())
             return json.loads(result[0].text)
 
         elif tool_name == "advanced_query":
-            import asyncio
             # Limit query results to prevent overflow
             if parameters.get("limit", 100) > 50:
                 parameters["limit"] = 50
                 logger.info("Limited query results to 50 to prevent context overflow")
 
-            result = asyncio.run(advanced_query(
+            result = run_tool(advanced_query(
                 parameters.get("filters", {}),
                 parameters.get("limit", 50),
                 parameters.get("fields_to_return")
@@ -220,8 +220,7 @@ def call_mcp_tool(tool_name: str, parameters: Dict[str, Any]) -> Any:
             return truncate_large_response(data, max_tokens=2000)
 
         elif tool_name == "aggregate_by_any_field":
-            import asyncio
-            result = asyncio.run(aggregate_by_any_field(
+            result = run_tool(aggregate_by_any_field(
                 parameters["group_by_field"],
                 parameters.get("aggregation_type", "count"),
                 parameters.get("value_field"),
@@ -231,8 +230,7 @@ def call_mcp_tool(tool_name: str, parameters: Dict[str, Any]) -> Any:
             return json.loads(result[0].text)
 
         elif tool_name == "cost_analysis_by_field":
-            import asyncio
-            result = asyncio.run(cost_analysis_by_field(
+            result = run_tool(cost_analysis_by_field(
                 parameters["group_by_field"],
                 parameters.get("filters"),
                 parameters.get("limit", 20)
@@ -240,15 +238,13 @@ def call_mcp_tool(tool_name: str, parameters: Dict[str, Any]) -> Any:
             return json.loads(result[0].text)
 
         elif tool_name == "get_statistics":
-            import asyncio
-            result = asyncio.run(get_statistics())
+            result = run_tool(get_statistics())
             data = json.loads(result[0].text)
             # Statistics can be large, truncate if needed
             return truncate_large_response(data, max_tokens=3000)
 
         elif tool_name == "get_total_cost":
-            import asyncio
-            result = asyncio.run(get_total_cost(
+            result = run_tool(get_total_cost(
                 parameters.get("applicationName"),
                 parameters.get("environment"),
                 parameters.get("owner"),
@@ -667,7 +663,7 @@ def main():
                                         "tool_call_id": tool_call.get("id"),
                                         "role": "tool",
                                         "name": tool_name,
-                                        "content": json.dumps(result)
+                                        "content": orjson.dumps(result, default=str).decode()
                                     })
 
                                     st.write(f"**Result:**")
@@ -722,7 +718,7 @@ def main():
                                     tool_results.append({
                                         "type": "tool_result",
                                         "tool_use_id": tool_use_id,
-                                        "content": json.dumps(result)
+                                        "content": orjson.dumps(result, default=str).decode()
                                     })
 
                                     st.write(f"**Result:**")
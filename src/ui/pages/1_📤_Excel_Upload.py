@@ -5,13 +5,14 @@ import streamlit as st
 import pandas as pd
 import os
 import sys
-from datetime import datetime
 import logging
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
 import config
-from src.processor.excel_reader import read_excel_in_chunks, extract_start_date_from_summary
+from src.processor.excel_reader import (
+    read_excel_in_chunks, extract_start_date_from_summary, get_excel_backend, prefetch_chunks
+)
 from src.processor.tag_parser import process_dataframe
 from src.processor.excel_writer import write_chunks_to_excel
 from src.utils.validators import validate_uploaded_file, validate_tag_column, validate_tag_column_in_file
@@ -35,6 +36,7 @@ st.set_page_config(
 
 def main():
     """Main Excel upload page function"""
+    config.ensure_dirs()
 
     # Title and description
     st.title("📤 Excel Upload & Processing")
@@ -53,7 +55,7 @@ def main():
         st.header("ℹ️ Information")
         st.markdown(f"""
         **Supported Formats:**
-        - File Types: {', '.join(config.ALLOWED_EXTENSIONS)}
+        - File Types: {', '.join(sorted(config.ALLOWED_EXTENSIONS))}
         - Max File Size: {config.MAX_FILE_SIZE_MB} MB
         - Required Column: `{config.TAG_COLUMN}`
 
@@ -99,7 +101,7 @@ def main():
     # File uploader
     uploaded_file = st.file_uploader(
         "Choose an Excel file",
-        type=['xlsx', 'xls'],
+        type=[ext.lstrip('.') for ext in sorted(config.ALLOWED_EXTENSIONS)],
         help=f"Upload an Excel file (max {config.MAX_FILE_SIZE_MB} MB)"
     )
 
@@ -139,7 +141,7 @@ def main():
 
         # Preview the file (from Data sheet)
         try:
-            preview_df = pd.read_excel(upload_path, sheet_name='Data', nrows=5, engine='openpyxl')
+            preview_df = pd.read_excel(upload_path, sheet_name='Data', nrows=5, engine=get_excel_backend())
 
             st.subheader("📋 File Preview from Data sheet (first 5 rows)")
             st.dataframe(preview_df, use_container_width=True)
@@ -242,7 +244,8 @@ def process_file(upload_path: str, original_filename: str):
         total_rows_estimate = 0
 
         chunk_count = 0
-        for chunk, total_rows in read_excel_in_chunks(upload_path, sheet_name='Data'):
+        # The next chunk is parsed in a background thread while this one is processed
+        for chunk, total_rows in prefetch_chunks(read_excel_in_chunks(upload_path, sheet_name='Data')):
             chunk_count += 1
             total_rows_estimate = total_rows if total_rows > 0 else total_processed
 
@@ -268,9 +271,10 @@ def process_file(upload_path: str, original_filename: str):
 
         status_text.text("🔄 Combining chunks...")
         final_df = pd.concat(processed_chunks, ignore_index=True)
+        # The combined frame is kept for the database push; the chunks are not needed again
+        processed_chunks = None
 
-        timestamp = datetime.now().strftime(config.OUTPUT_FILENAME_TIMESTAMP_FORMAT)
-        output_filename = f"{config.OUTPUT_FILENAME_PREFIX}{timestamp}_{original_filename}"
+        output_filename = config.make_output_name(original_filename)
         output_path = os.path.join(config.PROCESSED_DIR, output_filename)
 
         st.markdown("---")
@@ -302,7 +306,7 @@ def process_file(upload_path: str, original_filename: str):
                         except:
                             col3.metric("Status", "Processing...")
 
-        write_chunks_to_excel(processed_chunks, output_path, progress_callback=excel_progress_callback)
+        write_chunks_to_excel([final_df], output_path, progress_callback=excel_progress_callback)
 
         excel_progress_bar.progress(100)
         excel_status_text.text("")
@@ -340,7 +344,7 @@ def process_file(upload_path: str, original_filename: str):
 
         # Show preview
         st.subheader("👀 Results Preview (first 100 rows)")
-        preview_columns = [config.TAG_COLUMN, 'Application Name', 'Environment', 'Owner', 'Cost', 'Date']
+        preview_columns = [config.TAG_COLUMN, *config.NEW_COLUMN_ORDER, 'Cost', 'Date']
         available_preview_cols = [col for col in preview_columns if col in list(final_df.columns)]
 
         if available_preview_cols:
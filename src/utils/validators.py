@@ -10,6 +10,7 @@ import sys
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 import config
+from src.processor.excel_reader import get_excel_backend, is_large_file, iter_column_values
 
 logger = logging.getLogger(__name__)
 
@@ -34,9 +35,9 @@ def validate_file(file_path: str) -> Tuple[bool, str]:
         return False, f"Path is not a file: {file_path}"
 
     # Check file extension
-    _, ext = os.path.splitext(file_path)
-    if ext.lower() not in config.ALLOWED_EXTENSIONS:
-        return False, f"Invalid file extension: {ext}. Allowed: {config.ALLOWED_EXTENSIONS}"
+    if not config.is_allowed(file_path):
+        _, ext = os.path.splitext(file_path)
+        return False, f"Invalid file extension: {ext}. Allowed: {sorted(config.ALLOWED_EXTENSIONS)}"
 
     # Check file size
     file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
@@ -124,13 +125,17 @@ def validate_tag_column_in_file(file_path: str, sheet_name: str = 'Data', tag_co
     if tag_column is None:
         tag_column = config.TAG_COLUMN
 
+    # Large files: stream the Tags column instead of loading the sheet
+    if is_large_file(file_path):
+        return _validate_tag_column_streaming(file_path, sheet_name, tag_column, sample_size)
+
     try:
         # Read the file (all rows or sample)
         if sample_size is not None:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, nrows=sample_size, engine='openpyxl')
+            df = pd.read_excel(file_path, sheet_name=sheet_name, nrows=sample_size, engine=get_excel_backend())
             logger.info(f"Reading sample of {sample_size} rows for validation")
         else:
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl')
+            df = pd.read_excel(file_path, sheet_name=sheet_name, engine=get_excel_backend())
             logger.info(f"Reading entire file for validation")
 
     except Exception as e:
@@ -143,6 +148,41 @@ def validate_tag_column_in_file(file_path: str, sheet_name: str = 'Data', tag_co
     # Calculate statistics
     total_rows = len(df)
     empty_rows = int(df[tag_column].isna().sum())
+
+    return _tag_column_result(tag_column, total_rows, empty_rows)
+
+
+def _validate_tag_column_streaming(
+    file_path: str,
+    sheet_name: str,
+    tag_column: str,
+    sample_size: int = None
+) -> Tuple[bool, str, dict]:
+    """
+    Streaming variant of validate_tag_column_in_file for large files.
+
+    Reads the Tags column row-by-row with openpyxl's read-only mode, so memory
+    use stays proportional to one row instead of the whole sheet.
+    """
+    logger.info(f"Streaming Tags column for validation (file larger than {config.STREAM_THRESHOLD_MB} MB)")
+
+    total_rows = 0
+    empty_rows = 0
+    try:
+        for value in iter_column_values(file_path, tag_column, sheet_name, max_rows=sample_size):
+            total_rows += 1
+            if value is None:
+                empty_rows += 1
+    except KeyError as e:
+        return False, str(e.args[0]), {}
+    except Exception as e:
+        return False, f"Error reading file: {str(e)}", {}
+
+    return _tag_column_result(tag_column, total_rows, empty_rows)
+
+
+def _tag_column_result(tag_column: str, total_rows: int, empty_rows: int) -> Tuple[bool, str, dict]:
+    """Build the (is_valid, error_message, statistics) result for Tags column validation."""
     non_empty_rows = total_rows - empty_rows
     empty_percentage = (empty_rows / total_rows * 100) if total_rows > 0 else 0
 
@@ -188,7 +228,7 @@ def validate_excel_file(file_path: str) -> Tuple[bool, str]:
 
     # Try to read the file
     try:
-        df = pd.read_excel(file_path, nrows=5, engine='openpyxl')
+        df = pd.read_excel(file_path, nrows=5, engine=get_excel_backend())
     except Exception as e:
         return False, f"Cannot read Excel file: {str(e)}"
 
@@ -213,9 +253,9 @@ def validate_uploaded_file(uploaded_file) -> Tuple[bool, str]:
         return False, "No file uploaded"
 
     # Check file extension
-    file_ext = os.path.splitext(uploaded_file.name)[1].lower()
-    if file_ext not in config.ALLOWED_EXTENSIONS:
-        return False, f"Invalid file extension: {file_ext}. Allowed: {config.ALLOWED_EXTENSIONS}"
+    if not config.is_allowed(uploaded_file.name):
+        file_ext = os.path.splitext(uploaded_file.name)[1]
+        return False, f"Invalid file extension: {file_ext}. Allowed: {sorted(config.ALLOWED_EXTENSIONS)}"
 
     # Check file size
     if hasattr(uploaded_file, 'size'):
@@ -0,0 +1,80 @@
+"""
+Unit tests for configuration helpers
+"""
+import pytest
+import sys
+import os
+from dataclasses import replace
+from types import SimpleNamespace
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import config
+
+
+class TestChunkSize:
+    """Test cases for memory-based chunk sizing"""
+
+    def test_chunk_size_within_bounds(self):
+        """Test that the computed chunk size is clamped to the allowed band"""
+        assert config.MIN_CHUNK_SIZE <= config.CHUNK_SIZE <= config.MAX_CHUNK_SIZE
+
+    def test_wide_rows_give_smaller_chunks(self):
+        """Test that wider rows never produce larger chunks"""
+        assert config.get_chunk_size(100_000) <= config.get_chunk_size(100)
+
+    def test_huge_rows_clamped_to_minimum(self, monkeypatch):
+        """Test that an enormous row estimate still yields the minimum chunk size"""
+        memory = SimpleNamespace(available=8 * 1024 ** 3)
+        monkeypatch.setattr(config, 'psutil', SimpleNamespace(virtual_memory=lambda: memory))
+        monkeypatch.setattr(config, '_settings', replace(config._settings, chunk_size=None))
+
+        assert config.get_chunk_size(10 ** 15) == config.MIN_CHUNK_SIZE
+
+
+class TestSettings:
+    """Test cases for environment-variable settings"""
+
+    def test_env_overrides(self, monkeypatch):
+        """Test that environment variables override the defaults"""
+        monkeypatch.setenv('CHUNK_SIZE', '5000')
+        monkeypatch.setenv('NUM_WORKERS', '3')
+        monkeypatch.setenv('MONGODB_DATABASE', 'testdb')
+        monkeypatch.setenv('MONGODB_INSERT_WORKERS', '4')
+        monkeypatch.delenv('MONGODB_URI', raising=False)
+        config.get_settings.cache_clear()
+        try:
+            settings = config.get_settings()
+            assert settings.chunk_size == 5000
+            assert settings.num_workers == 3
+            assert settings.mongodb_database == 'testdb'
+            assert settings.mongodb_insert_workers == 4
+            # Pool covers two connections per worker plus the insert threads
+            assert 'maxPoolSize=10&' in settings.mongodb_uri
+            assert 'minPoolSize=4&' in settings.mongodb_uri
+        finally:
+            config.get_settings.cache_clear()
+
+    def test_settings_are_frozen(self):
+        """Test that settings cannot be modified after loading"""
+        with pytest.raises(Exception):
+            config.get_settings().num_workers = 1
+
+
+class TestAllowedExtensions:
+    """Test cases for upload extension checks"""
+
+    def test_extension_check_is_case_insensitive(self):
+        """Test that upper-case extensions (e.g. from Windows) are accepted"""
+        assert config.is_allowed('report.xlsx')
+        assert config.is_allowed('REPORT.XLSX')
+        assert config.is_allowed('C:/exports/Costs.Xls')
+
+    def test_other_extensions_rejected(self):
+        """Test that non-Excel files are rejected"""
+        assert not config.is_allowed('report.csv')
+        assert not config.is_allowed('xlsx')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,111 @@
+"""
+Unit tests for MongoDB operations helpers
+"""
+import pytest
+import pandas as pd
+import sys
+import os
+from datetime import datetime
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from src.database.mongodb_operations import (
+    clean_dataframe, encode_document, find_cost_columns, iter_batches, prepare_document, to_numeric_cost
+)
+
+
+class TestIterBatches:
+    """Test cases for count- and size-bounded insert batching"""
+
+    def test_batches_capped_by_count(self):
+        """Test that no batch holds more than max_docs documents"""
+        docs = [encode_document({'n': i}) for i in range(25)]
+        batches = list(iter_batches(docs, max_docs=10))
+
+        assert [len(batch) for batch in batches] == [10, 10, 5]
+
+    def test_batches_capped_by_bytes(self):
+        """Test that a batch is closed before it exceeds max_bytes"""
+        docs = [encode_document({'payload': 'x' * 100}) for _ in range(10)]
+        doc_bytes = len(docs[0].raw)
+        batches = list(iter_batches(docs, max_docs=100, max_bytes=doc_bytes * 3))
+
+        assert [len(batch) for batch in batches] == [3, 3, 3, 1]
+        assert sum(len(batch) for batch in batches) == len(docs)
+
+    def test_oversized_document_gets_own_batch(self):
+        """Test that a document larger than max_bytes is still sent, alone"""
+        docs = [{'payload': 'x' * 1000}, {'n': 1}]
+        batches = list(iter_batches(docs, max_docs=100, max_bytes=100))
+
+        assert [len(batch) for batch in batches] == [1, 1]
+
+
+class TestNumericCost:
+    """Test cases for cost normalization at import"""
+
+    def test_numeric_strings_converted(self):
+        """Test that costs read as text are stored as floats"""
+        assert to_numeric_cost('12.50') == 12.5
+        assert to_numeric_cost(' 3 ') == 3.0
+
+    def test_other_values_unchanged(self):
+        """Test that numbers and non-numeric text are kept as they are"""
+        assert to_numeric_cost(7) == 7
+        assert to_numeric_cost('n/a') == 'n/a'
+
+
+class TestCostColumns:
+    """Test cases for the per-sheet cost column lookup"""
+
+    def test_present_columns_in_preference_order(self):
+        """Test that only existing cost columns are returned, preferred first"""
+        assert find_cost_columns(['PreTaxCost', 'Owner', 'Cost']) == ['Cost', 'PreTaxCost']
+        assert find_cost_columns(['Owner']) == []
+
+    def test_falls_back_to_next_cost_column(self):
+        """Test that an empty preferred cost column falls through to the next one"""
+        record = {'Cost': None, 'PreTaxCost': '4.5', 'Owner': 'alice'}
+        doc = prepare_document(record, cost_columns=find_cost_columns(record))
+
+        assert doc['cost'] == 4.5
+        assert 'preTaxCost' not in doc
+
+
+class TestCleanDataframe:
+    """Test cases for the DataFrame-wide cleanup before document preparation"""
+
+    def test_missing_values_become_none(self):
+        """Test that NaN and NaT are replaced by None in every column"""
+        df = pd.DataFrame({
+            'Cost': [1.5, float('nan')],
+            'Owner': ['alice', None],
+            'Seen': [pd.Timestamp('2024-01-02 03:04:05'), pd.NaT],
+        })
+        records = clean_dataframe(df).to_dict(orient='records')
+
+        assert records[1] == {'Cost': None, 'Owner': None, 'Seen': None}
+
+    def test_timestamps_become_iso_strings(self):
+        """Test that datetime columns are formatted as ISO 8601"""
+        df = pd.DataFrame({'Seen': [pd.Timestamp('2024-01-02 03:04:05')]})
+
+        assert clean_dataframe(df)['Seen'].iloc[0] == '2024-01-02T03:04:05'
+
+    def test_timestamps_keep_isoformat_precision(self):
+        """Test that microseconds and the UTC offset are kept"""
+        seen = pd.Timestamp('2024-01-02 03:04:05.123456', tz='UTC')
+        df = pd.DataFrame({'Seen': [seen]})
+
+        assert clean_dataframe(df)['Seen'].iloc[0] == seen.isoformat()
+
+    def test_mixed_object_column(self):
+        """Test that datetimes in object columns are converted as well"""
+        df = pd.DataFrame({'Date': [datetime(2024, 1, 2, 3, 4, 5), 'n/a', None]})
+        records = clean_dataframe(df).to_dict(orient='records')
+
+        assert [r['Date'] for r in records] == ['2024-01-02T03:04:05', 'n/a', None]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -7,7 +7,8 @@ import os
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-from src.processor.tag_parser import parse_tags
+import pandas as pd
+from src.processor.tag_parser import parse_tags, process_dataframe
 
 
 class TestTagParser:
@@ -121,5 +122,30 @@ class TestTagParser:
         assert result['Owner'] == 'data'
 
 
+class TestProcessDataframe:
+    """Test cases for parsing a whole Tags column"""
+
+    def test_matches_row_by_row_parsing(self):
+        """Test that column-wise parsing gives the same values as parse_tags per row"""
+        tags = [
+            "applicationname:myapp,environment:prod,owner:john",
+            '{"applicationname": "api", "owner": "jane"}',
+            None,
+            "environment:dev;env:test,usage: a|b ",
+            "myapp|prod|john",
+        ]
+        df = pd.DataFrame({'Name': ['a', 'b', 'c', 'd', 'e'], 'Tags': tags})
+        result = process_dataframe(df, date_value='2024-01')
+
+        for row, tag in enumerate(tags):
+            expected = parse_tags(tag)
+            for column in ('Application Name', 'Environment', 'Owner', 'Usage'):
+                value = result[column].iloc[row]
+                assert (None if pd.isna(value) else value) == expected.get(column)
+
+        assert list(result.columns[2:5]) == ['Application Name', 'Environment', 'Owner']
+        assert (result['Date'] == '2024-01').all()
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])